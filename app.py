@@ -1,10 +1,9 @@
 import streamlit as st
-import numpy as np
-import librosa
-import io
-import time
-import plotly.graph_objects as go
-from datetime import datetime
+
+from voxsense import (EMOTIONS, LANGUAGES, get_cache, start_warmup, HistoryRing, put_audio, get_audio,
+                      put_timeline, get_timeline, session_report, load_envelope, STEPS, QueueFull, get_jobs,
+                      get_classifier)
+from charts import waveform_chart, confidence_chart, timeline_chart, speaker_timeline_chart
 
 st.set_page_config(
     page_title="VoxSense",
@@ -12,6 +11,9 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="collapsed"
 )
+# librosa's lazy imports and numba kernels load in the background while the page
+# renders and the user picks a file, instead of inside the first Analyse click
+start_warmup()
 
 st.markdown("""
 <style>
@@ -138,147 +140,57 @@ h1,h2,h3,h4 { color: #e8e3d8 !important; }
 </style>
 """, unsafe_allow_html=True)
 
-EMOTIONS = {
-    "Calm":     {"emoji":"😌","scripts":"শান্ত · शांत · ਸ਼ਾਂਤ · ശാന്തം","color":"#10b981","css":"result-calm","description":"Relaxed, composed, low arousal"},
-    "Stressed": {"emoji":"😰","scripts":"চাপে · तनाव · ਤਣਾਅ · സമ്മർദ്ദം","color":"#f59e0b","css":"result-stressed","description":"Tense, anxious, high-pressure"},
-    "Angry":    {"emoji":"😠","scripts":"রাগ · गुस्सा · ਗੁੱਸਾ · കോപം","color":"#ef4444","css":"result-angry","description":"Elevated energy, sharp vocal edges"},
-    "Fearful":  {"emoji":"😨","scripts":"ভয় · डर · ਡਰ · ഭയം","color":"#8b5cf6","css":"result-fearful","description":"High pitch variability, erratic energy"},
-    "Happy":    {"emoji":"😊","scripts":"আনন্দ · खुशी · ਖੁਸ਼ੀ · സന്തോഷം","color":"#f97316","css":"result-happy","description":"Bright, energetic, elevated pitch"},
-    "Sad":      {"emoji":"😔","scripts":"দুঃখ · दुख · ਦੁੱਖ · സങ്കടം","color":"#3b82f6","css":"result-sad","description":"Low energy, slow tempo, falling pitch"},
-}
-
-LANGUAGES = {
-    "Bengali (বাংলা)":   {"offset":18,"scale":0.88,"note":"Vowel-rich, tonal — Eastern India & Bangladesh"},
-    "Hindi (हिंदी)":     {"offset":0, "scale":1.00,"note":"Baseline calibration — Indo-Aryan family"},
-    "Punjabi (ਪੰਜਾਬੀ)": {"offset":12,"scale":1.18,"note":"High-energy prosody, tonal language"},
-    "Tamil (தமிழ்)":     {"offset":8, "scale":0.95,"note":"Dravidian — distinct from Indo-Aryan family"},
-    "Telugu (తెలుగు)":   {"offset":6, "scale":0.97,"note":"Syllable-timed, melodic Dravidian rhythm"},
-    "Marathi (मराठी)":   {"offset":4, "scale":1.02,"note":"Close to Hindi but distinct prosodic stress"},
-    "Malayalam (മലയ.)":  {"offset":10,"scale":0.93,"note":"Complex morphology, Dravidian family"},
-    "Hinglish":           {"offset":5, "scale":1.05,"note":"Code-switching — language-agnostic processing"},
-    "Indian English":     {"offset":2, "scale":1.00,"note":"Distinct rhythm vs British/American English"},
+STAGE_TEXT = {
+    "decode":   "Decoding audio...",
+    "stft":     "Computing the spectrogram...",
+    "rms":      "Measuring energy...",
+    "zcr":      "Measuring zero-crossing rate...",
+    "vad":      "Detecting speech...",
+    "mel":      "Computing the mel spectrogram...",
+    "mfcc":     "Extracting MFCCs...",
+    "pitch":    "Tracking pitch...",
+    "tempo":    "Estimating tempo...",
+    "centroid": "Measuring spectral brightness...",
+    "contrast": "Measuring spectral contrast...",
+    "classify": "Running language-calibrated classifier...",
+    "timeline": "Analysing the full recording...",
 }
 
-def extract_features(audio_bytes):
-    try:
-        y, sr = librosa.load(io.BytesIO(audio_bytes), sr=22050, duration=10)
-        if len(y) < sr * 0.5:
-            return None, "Audio too short — please speak for at least 1 second."
-        mfcc       = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40)
-        pitches, _ = librosa.piptrack(y=y, sr=sr)
-        pv = pitches[pitches > 0]
-        rms        = librosa.feature.rms(y=y)
-        tempo, _   = librosa.beat.beat_track(y=y, sr=sr)
-        return {
-            "mfcc_mean":   np.mean(mfcc, axis=1),
-            "pitch_mean":  float(np.mean(pv))   if len(pv) else 0.0,
-            "pitch_std":   float(np.std(pv))    if len(pv) else 0.0,
-            "pitch_range": float(np.ptp(pv))    if len(pv) else 0.0,
-            "rms_mean":    float(np.mean(rms)),
-            "rms_std":     float(np.std(rms)),
-            "rms_max":     float(np.max(rms)),
-            "zcr":         float(np.mean(librosa.feature.zero_crossing_rate(y))),
-            "spec_cent":   float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))),
-            "contrast":    float(np.mean(librosa.feature.spectral_contrast(y=y, sr=sr))),
-            "tempo":       float(tempo),
-            "duration":    len(y)/sr,
-        }, None
-    except Exception as e:
-        return None, f"Processing error: {str(e)}"
-
-def classify_emotion(features, lang_key="Hindi (हिंदी)"):
-    cfg   = LANGUAGES.get(lang_key, LANGUAGES["Hindi (हिंदी)"])
-    pitch = max(0, features["pitch_mean"] - cfg["offset"])
-    energy= features["rms_mean"] * cfg["scale"]
-    prng  = features["pitch_range"]
-    estd  = features["rms_std"]
-    zcr   = features["zcr"]
-    scent = features["spec_cent"]
-    cont  = features["contrast"]
-    tempo = features["tempo"]
-
-    s = {e: 0.0 for e in EMOTIONS}
-
-    if energy < 0.012:   s["Calm"]+=0.35; s["Sad"]+=0.20
-    elif energy < 0.035: s["Calm"]+=0.25; s["Sad"]+=0.10; s["Stressed"]+=0.10
-    elif energy < 0.070: s["Stressed"]+=0.28; s["Happy"]+=0.15
-    elif energy < 0.120: s["Angry"]+=0.30; s["Stressed"]+=0.18; s["Happy"]+=0.10
-    else:                s["Angry"]+=0.42; s["Stressed"]+=0.12
-
-    if pitch > 0:
-        if pitch < 140:    s["Sad"]+=0.25; s["Calm"]+=0.15
-        elif pitch < 210:  s["Calm"]+=0.20; s["Happy"]+=0.10
-        elif pitch < 300:  s["Stressed"]+=0.22; s["Happy"]+=0.12
-        elif pitch < 400:  s["Fearful"]+=0.25; s["Stressed"]+=0.12
-        else:              s["Fearful"]+=0.32; s["Angry"]+=0.08
-
-    if prng > 250:   s["Fearful"]+=0.18; s["Stressed"]+=0.10
-    elif prng > 120: s["Stressed"]+=0.12; s["Happy"]+=0.08
-    elif prng < 40:  s["Calm"]+=0.12; s["Sad"]+=0.08
-
-    if zcr < 0.030:   s["Calm"]+=0.18; s["Sad"]+=0.10
-    elif zcr < 0.060: s["Stressed"]+=0.10; s["Happy"]+=0.08
-    elif zcr < 0.095: s["Angry"]+=0.18; s["Stressed"]+=0.08
-    else:             s["Angry"]+=0.22; s["Fearful"]+=0.08
-
-    if estd > 0.045:  s["Angry"]+=0.10; s["Stressed"]+=0.12
-    elif estd > 0.022:s["Stressed"]+=0.08; s["Happy"]+=0.05
-    else:             s["Calm"]+=0.10; s["Sad"]+=0.05
-
-    if scent < 1000:   s["Sad"]+=0.12; s["Calm"]+=0.08
-    elif scent < 2200: s["Calm"]+=0.08
-    elif scent < 3800: s["Stressed"]+=0.10; s["Happy"]+=0.08
-    else:              s["Angry"]+=0.14; s["Fearful"]+=0.06
-
-    if cont > 28:  s["Angry"]+=0.08; s["Happy"]+=0.06
-    elif cont < 10:s["Calm"]+=0.07;  s["Sad"]+=0.06
-
-    if tempo > 145:    s["Happy"]+=0.10; s["Stressed"]+=0.08
-    elif tempo < 70:   s["Sad"]+=0.12; s["Calm"]+=0.08
-
-    total = sum(s.values())
-    if total == 0: return "Calm", {e:1/6 for e in EMOTIONS}
-    probs = {e: round(v/total, 3) for e,v in s.items()}
-    return max(probs, key=probs.get), probs
-
-def waveform_chart(audio_bytes, color="#f97316"):
-    try:
-        y, sr = librosa.load(io.BytesIO(audio_bytes), sr=22050, duration=10)
-        step = max(1, len(y)//700)
-        yd = y[::step]
-        t  = np.linspace(0, len(y)/sr, len(yd))
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=t, y=yd, mode="lines",
-            line=dict(color=color, width=1.2),
-            fill="tozeroy", fillcolor=color+"14"))
-        fig.update_layout(
-            plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
-            height=110, margin=dict(l=0,r=0,t=0,b=0),
-            showlegend=False, xaxis=dict(visible=False), yaxis=dict(visible=False))
-        return fig
-    except: return None
-
-def confidence_chart(probs):
-    pairs = sorted(zip([v*100 for v in probs.values()], probs.keys(),
-                       [EMOTIONS[e]["color"] for e in probs.keys()]), reverse=True)
-    vals, ems, cols = zip(*pairs)
-    fig = go.Figure(go.Bar(
-        x=list(vals), y=list(ems), orientation="h",
-        marker=dict(color=list(cols), opacity=0.85),
-        text=[f"{v:.1f}%" for v in vals],
-        textposition="outside", textfont=dict(color="#9b96a0", size=11, family="DM Mono"),
-    ))
-    fig.update_layout(
-        plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
-        height=240, margin=dict(l=10,r=60,t=10,b=10), showlegend=False,
-        font=dict(color="#6b6570", family="DM Sans"),
-        xaxis=dict(range=[0,115], gridcolor="rgba(255,255,255,0.04)",
-                   ticksuffix="%", tickfont=dict(color="#4a4550",size=10)),
-        yaxis=dict(gridcolor="rgba(0,0,0,0)", tickfont=dict(color="#9b96a0",size=12)))
-    return fig
-
-for k,v in [("history",[]),("total",0)]:
-    if k not in st.session_state: st.session_state[k] = v
+@st.fragment(run_every=0.5)
+def job_status():
+    # Polls this session's background job; only this fragment reruns until the job finishes
+    pending = st.session_state.get("job")
+    job     = get_jobs().get(pending["id"]) if pending else None
+    if job is None:
+        st.session_state.pop("job", None); return
+    if not job.done:
+        i    = STEPS.index(job.stage) + 1 if job.stage else 0
+        text = "Waiting for a free worker..." if job.status == "queued" else STAGE_TEXT[STEPS[min(i, len(STEPS) - 1)]]
+        st.progress(int(100 * job.progress), text=text)
+        if st.button("✕  Cancel", use_container_width=True): get_jobs().cancel(job.id)
+        return
+    del st.session_state.job
+    if job.status == "error": st.session_state.job_error = job.error
+    if job.status == "done" and job.result is None:
+        st.session_state.job_error = "The result expired before this page collected it — please analyse the file again."
+    elif job.status == "done":
+        r = job.result
+        st.session_state.history.append(r["emotion"], r["confidence"], job.lang_key)
+        st.session_state.last_emotion   = r["emotion"]
+        st.session_state.last_probs     = r["probs"]
+        st.session_state.last_audio_key = pending["audio_key"]
+        st.session_state.last_features  = r["features"]
+        for k in ("channels", "speaker"):
+            if k in r: st.session_state[f"last_{k}"] = r[k]
+            else:      st.session_state.pop(f"last_{k}", None)
+        # Only the key: the timeline itself lives in the shared cache, like the upload
+        st.session_state.last_timeline = put_timeline(pending["audio_key"], job.lang_key, r.get("timeline"))
+        # Everything is in the session / the cache now; the queue need not hold the result
+        get_jobs().release(job.id)
+    st.rerun()
+
+HISTORY_SIZE = 6   # rows the Session History panel shows
+if "history" not in st.session_state: st.session_state.history = HistoryRing(HISTORY_SIZE)
 
 # ── NAVBAR ────────────────────────────────────────────────────────────────────
 st.markdown("""
@@ -361,29 +273,13 @@ with col_left:
         audio_bytes = uploaded.read()
         st.markdown("<br>", unsafe_allow_html=True)
         if st.button("🔍  Analyse Emotion", use_container_width=True):
-            prog = st.progress(0, text="Loading audio...")
-            time.sleep(0.3)
-            prog.progress(30, text="Extracting acoustic features (MFCC, pitch, energy)...")
-            features, error = extract_features(audio_bytes)
-            prog.progress(65, text="Running language-calibrated classifier...")
-            time.sleep(0.3)
-            if error:
-                prog.empty(); st.error(f"⚠️ {error}")
-            else:
-                emotion, probs = classify_emotion(features, lang_key)
-                prog.progress(100, text="Done."); time.sleep(0.3); prog.empty()
-                st.session_state.history.append({
-                    "time": datetime.now().strftime("%H:%M"),
-                    "emotion": emotion,
-                    "confidence": round(probs[emotion]*100,1),
-                    "language": lang_key.split(" ")[0],
-                })
-                st.session_state.total += 1
-                st.session_state.last_emotion  = emotion
-                st.session_state.last_probs    = probs
-                st.session_state.last_audio    = audio_bytes
-                st.session_state.last_features = features
-                st.rerun()
+            # Queued in the background: this script run ends at once and job_status() polls
+            jobs = get_jobs()
+            if "job" in st.session_state: jobs.cancel(st.session_state.pop("job")["id"])
+            try:
+                st.session_state.job = {"id": jobs.submit(audio_bytes, lang_key), "audio_key": put_audio(audio_bytes)}
+            except QueueFull as e:
+                st.warning(f"⏳ {e}")
     else:
         st.markdown("""
         <div style="background:#16191f;border:1.5px dashed rgba(255,255,255,0.1);
@@ -394,6 +290,8 @@ with col_left:
                 <small style="color:#4a4550">Speak naturally for 3–8 seconds · any Indian language</small>
             </div>
         </div>""", unsafe_allow_html=True)
+    if "job" in st.session_state: job_status()
+    if "job_error" in st.session_state: st.error(f"⚠️ {st.session_state.pop('job_error')}")
 
 with col_right:
     if "last_emotion" in st.session_state:
@@ -408,10 +306,31 @@ with col_right:
             <div class="result-script">{info['scripts']}</div>
             <div class="result-confidence" style="color:{info['color']}">{conf}%</div>
             <div style="font-size:0.75rem;color:#4a4550;margin-top:6px">{info['description']}</div>
+            {f'<div style="font-size:0.75rem;color:#6b6570;margin-top:4px">{st.session_state.last_speaker.title()}</div>'
+             if st.session_state.get("last_speaker") else ""}
         </div>""", unsafe_allow_html=True)
-        if "last_audio" in st.session_state:
-            fw = waveform_chart(st.session_state.last_audio, info["color"])
+        key   = st.session_state.get("last_audio_key")
+        audio = get_audio(key)
+        if audio is not None:
+            # Long recordings get the whole call, streamed once into a cached pyramid, plus a zoom range
+            whole = bool(st.session_state.get("last_timeline"))
+            pyr   = load_envelope(audio, key, full=whole)
+            t0, t1 = st.slider("Zoom (s)", 0.0, float(pyr.duration), (0.0, float(pyr.duration)),
+                               label_visibility="collapsed") if whole else (0.0, None)
+            fw = waveform_chart(pyr, info["color"], t0, t1)
             if fw: st.plotly_chart(fw, use_container_width=True, config={"displayModeBar":False})
+        if st.session_state.get("last_channels"):
+            for c, r in zip(st.columns(len(st.session_state.last_channels)), st.session_state.last_channels):
+                c.markdown(f"""
+                <div style="text-align:center;font-size:0.8rem;color:#6b6570">{r['label'].title()}<br>
+                    <span style="font-size:1.1rem;color:{EMOTIONS[r['emotion']]['color']}">
+                    {EMOTIONS[r['emotion']]['emoji']} {r['emotion']} · {r['confidence']}%</span></div>""",
+                    unsafe_allow_html=True)
+        tl = get_timeline(st.session_state.get("last_timeline"))
+        if tl:
+            st.caption(f"Full recording · {len(tl)} windows · {tl[-1]['end']/60:.1f} min")
+            chart = speaker_timeline_chart(tl) if "channels" in tl[0] else timeline_chart(tl)
+            st.plotly_chart(chart, use_container_width=True, config={"displayModeBar":False})
         st.plotly_chart(confidence_chart(probs), use_container_width=True, config={"displayModeBar":False})
         with st.expander("🔬  Raw Acoustic Features"):
             f = st.session_state.last_features
@@ -420,6 +339,13 @@ with col_right:
             c2.metric("Energy",f"{f['rms_mean']:.4f}")
             c3.metric("Rate",f"{f['zcr']:.4f}")
             c4.metric("Tempo",f"{f['tempo']:.0f} BPM")
+            st.caption(f"Classifier · {get_classifier().name}")
+            cs = get_cache().stats()
+            st.caption(f"Cache · {cs['hits']} hits · {cs['disk_hits']} disk · {cs['misses']} misses · "
+                       f"{cs['evictions']} evicted · {cs['bytes']/2**20:.1f}/{cs['max_bytes']/2**20:.0f} MB")
+            mem = session_report(st.session_state)
+            st.caption(f"This session · {mem['total']/1024:.1f} KB held · largest: " +
+                       ", ".join(f"{k} {v/1024:.1f} KB" for k, v in list(mem["keys"].items())[:3]))
     else:
         st.markdown("""
         <div style="background:#16191f;border:1px solid rgba(255,255,255,0.05);
@@ -429,10 +355,10 @@ with col_right:
         </div>""", unsafe_allow_html=True)
 
 # ── HISTORY ───────────────────────────────────────────────────────────────────
-if st.session_state.history:
+if len(st.session_state.history):
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown('<div class="section-label">Session History</div>', unsafe_allow_html=True)
-    for entry in reversed(st.session_state.history[-6:]):
+    for entry in st.session_state.history.latest():
         info = EMOTIONS[entry["emotion"]]
         st.markdown(f"""
         <div class="history-item">
@@ -0,0 +1,58 @@
+"""Multichannel benchmark: wall time per call for 1–N speaker channels.
+
+Compares analysing one channel with analysing every channel of the same recording
+one after another, on the shared thread pool, and on a warmed-up process pool. On
+a machine with at least as many free cores as channels, the parallel rows should
+stay close to the single-channel time.
+
+    python benchmarks/channels.py
+    python benchmarks/channels.py --channels 2 4 --seconds 10 --json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR, DEFAULT_LANGUAGE, analyse_signals, warmup
+from voxsense.channels import _analyse
+from suite import speech_like
+
+def median_ms(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter(); fn(); times.append(time.perf_counter() - t0)
+    return round(1000 * float(np.median(times)), 2)
+
+def run(channels=(2,), seconds=10.0, repeats=5):
+    rows = []
+    with ProcessPoolExecutor(max(channels), initializer=warmup) as procs:
+        for n in channels:
+            Y = np.stack([speech_like(seconds, SR, seed) for seed in range(n)])
+            _analyse(Y[0], SR, DEFAULT_LANGUAGE, None, None)    # numba JIT / FFT plan warm-up
+            list(procs.map(np.sum, range(n)))                     # spawn the workers before timing
+            rows.append({"channels": n, "seconds": seconds, "cpus": os.cpu_count(),
+                         "one_ms":     median_ms(lambda: _analyse(Y[0], SR, DEFAULT_LANGUAGE, None, None), repeats),
+                         "serial_ms":  median_ms(lambda: [_analyse(y, SR, DEFAULT_LANGUAGE, None, None) for y in Y], repeats),
+                         "threads_ms": median_ms(lambda: analyse_signals(Y, SR), repeats),
+                         "procs_ms":   median_ms(lambda: analyse_signals(Y, SR, executor=procs), repeats)})
+    return rows
+
+def print_table(rows):
+    print(f"{'ch':>3} {'secs':>5} {'cpus':>4} | {'1 ch ms':>8} {'serial':>8} {'threads':>8} {'procs':>8}")
+    for r in rows:
+        print(f"{r['channels']:>3} {r['seconds']:>5g} {r['cpus']:>4} | {r['one_ms']:>8} {r['serial_ms']:>8} "
+              f"{r['threads_ms']:>8} {r['procs_ms']:>8}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--channels", type=int, nargs="+", default=(2,), help="channel counts to try")
+    ap.add_argument("--seconds", type=float, default=10.0, help="clip length (default: 10, the analysed maximum)")
+    ap.add_argument("--repeats", type=int, default=5, help="runs per case; the median is reported")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    rows = run(tuple(args.channels), args.seconds, args.repeats)
+    print(json.dumps(rows, indent=2)) if args.json else print_table(rows)
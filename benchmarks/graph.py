@@ -0,0 +1,61 @@
+"""Lazy feature graph report: which nodes each consumer evaluates, and what it costs.
+
+Every consumer requests only the features it reads. features_from_signal runs
+those features' nodes and their dependencies, and nothing else. For each
+consumer this prints the nodes that actually ran (recorded through the stage
+hook, not taken from plan()), the median time, and the saving against
+extracting every feature.
+
+    python benchmarks/graph.py
+    python benchmarks/graph.py --seconds 10 --pitch yin --vad --json
+"""
+import os
+import sys
+import json
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR, DEFAULT_PITCH, FEATURE_COLUMNS, FEATURES, SCALARS, features_from_signal
+from suite import StageTimer, speech_like
+
+CONSUMERS = {
+    "everything (store)":   FEATURES,
+    "export (csv / api)":   SCALARS,
+    "classifier / ui":      FEATURE_COLUMNS,
+    "ui feature panel":     ("pitch_mean", "rms_mean", "zcr", "tempo"),
+    "energy + speech only": ("rms_mean", "rms_std", "zcr", "speech_ratio"),
+    "pitch only":           ("pitch_mean", "pitch_std", "pitch_range"),
+}
+
+def run(seconds=5.0, pitch=DEFAULT_PITCH, vad=False, repeats=5):
+    y = speech_like(seconds, SR)
+    features_from_signal(y, SR, pitch, vad=vad)                # numba JIT / FFT plan warm-up
+    rows = []
+    for name, want in CONSUMERS.items():
+        runs = []
+        for _ in range(repeats):
+            timer = StageTimer()
+            features_from_signal(y, SR, pitch, timer, vad, want)
+            runs.append(timer.ms)
+        rows.append({"consumer": name, "features": len(want), "nodes": list(runs[0]),
+                     "ms": round(float(np.median([sum(r.values()) for r in runs])), 2)})
+    full = rows[0]["ms"]
+    for r in rows: r["saved"] = round(1 - r["ms"] / full, 3)
+    return rows
+
+def print_table(rows):
+    print(f"{'consumer':<22} {'feats':>5} {'ms':>8} {'saved':>6}  nodes evaluated")
+    for r in rows:
+        print(f"{r['consumer']:<22} {r['features']:>5} {r['ms']:>8} {r['saved']:>6.0%}  {' → '.join(r['nodes'])}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--seconds", type=float, default=5.0, help="clip length (default: 5)")
+    ap.add_argument("--pitch", default=DEFAULT_PITCH, help="pitch backend (default: $VOXSENSE_PITCH or piptrack)")
+    ap.add_argument("--vad", action="store_true", help="with voice-activity gating")
+    ap.add_argument("--repeats", type=int, default=5, help="runs per consumer; the median is reported")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    rows = run(args.seconds, args.pitch, args.vad, args.repeats)
+    print(json.dumps(rows, indent=2)) if args.json else print_table(rows)
@@ -0,0 +1,84 @@
+"""Classifier backend benchmark: the rules vs a trained model, one clip at a time and batched.
+
+No labelled corpus ships with the repo, so the model is trained on synthetic rows.
+The rows come from features of speech-like clips, jittered, and labelled by the rules
+themselves. That says nothing about accuracy, only about cost. The benchmark reports:
+  - the size and load time of the model file, compact .npz vs joblib
+  - the latency of classify() on one feature dict
+  - classify_batch() latency per row at N = 1, 64, 1024
+
+    python benchmarks/model.py
+    python benchmarks/model.py --rows 4096 --batch 1 256 4096 --json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR, EMOTION_NAMES, FEATURE_COLUMNS, RuleClassifier, EmotionModel, fit_model, features_from_signal
+from suite import speech_like
+
+BATCH = (1, 64, 1024)
+
+def synthetic_rows(n, clips=16, seed=0):
+    # Feature dicts from `clips` speech-like clips: MFCCs jittered by ±20%, scalars scaled
+    # by up to 3× either way so the rules spread the rows over several emotions
+    rng  = np.random.default_rng(seed)
+    base = [features_from_signal(speech_like(2.0, SR, s), SR, want=("mfcc_mean",) + FEATURE_COLUMNS)
+            for s in range(clips)]
+    rows = []
+    for i in range(n):
+        f = base[i % clips]
+        rows.append({k: (v * rng.uniform(0.8, 1.2, np.shape(v)) if k == "mfcc_mean" else v * np.exp(rng.uniform(-1.1, 1.1)))
+                     for k, v in f.items()})
+    return rows
+
+def median_ms(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter(); fn(); times.append(time.perf_counter() - t0)
+    return 1000 * float(np.median(times))
+
+def run(n_rows=1024, batches=BATCH, repeats=20):
+    rows   = synthetic_rows(max(n_rows, max(batches)))
+    rules  = RuleClassifier()
+    labels = [EMOTION_NAMES[i] for i in rules.classify_batch(rows).argmax(axis=1)]
+    model  = fit_model(rows[:n_rows], labels[:n_rows])
+    files  = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for ext in ("npz", "joblib"):
+            path = os.path.join(tmp, f"model.{ext}")
+            model.save(path)
+            EmotionModel.load(path)                                   # sklearn imports, first-load costs
+            files[ext] = {"bytes": os.path.getsize(path), "load_ms": round(median_ms(lambda: EmotionModel.load(path), repeats), 3)}
+    agree   = float((model.classify_batch(rows).argmax(axis=1) == [EMOTION_NAMES.index(e) for e in labels]).mean())
+    results = []
+    for name, clf in (("rules", rules), (model.name, model)):
+        clf.classify(rows[0])
+        row = {"backend": name, "clip_ms": round(median_ms(lambda: clf.classify(rows[0]), repeats * 10), 4)}
+        for n in batches:
+            row[f"batch_{n}_us_per_row"] = round(1000 * median_ms(lambda: clf.classify_batch(rows[:n]), repeats) / n, 2)
+        results.append(row)
+    return {"rows": n_rows, "agreement_with_rules": round(agree, 3), "files": files, "backends": results}
+
+def print_report(report):
+    print(f"trained on {report['rows']} synthetic rows labelled by the rules · agreement {report['agreement_with_rules']:.1%}")
+    for ext, f in report["files"].items(): print(f"  {ext:<7} {f['bytes']:>7} B   load {f['load_ms']:.3f} ms")
+    keys = [k for k in report["backends"][0] if k.startswith("batch_")]
+    print(f"{'backend':<20} {'clip ms':>8} " + " ".join(f"{k[6:-11]:>9}" for k in keys) + "   (µs per row, batched)")
+    for r in report["backends"]:
+        print(f"{r['backend']:<20} {r['clip_ms']:>8} " + " ".join(f"{r[k]:>9}" for k in keys))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=1024, help="synthetic training rows (default: 1024)")
+    ap.add_argument("--batch", type=int, nargs="+", default=BATCH, help="batch sizes to time (default: 1 64 1024)")
+    ap.add_argument("--repeats", type=int, default=20, help="runs per measurement; the median is reported")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    report = run(args.rows, args.batch, args.repeats)
+    print(json.dumps(report, indent=2)) if args.json else print_report(report)
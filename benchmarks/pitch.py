@@ -0,0 +1,89 @@
+"""Pitch backend benchmark: piptrack vs vectorised YIN.
+
+Compares speed, peak memory and the resulting pitch_* statistics on synthetic
+tones with a known f0, and on real speech files passed on the command line.
+
+    python benchmarks/pitch.py                      # synthetic tones only
+    python benchmarks/pitch.py call1.wav call2.flac # plus real speech
+    python benchmarks/pitch.py --librosa-example    # plus librosa's LibriSpeech clip (downloads once)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import librosa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR, N_FFT, HOP, PITCH_BACKENDS, classify_emotion, features_from_signal
+
+def synthetic_cases(seconds=10.0, sr=SR):
+    t = np.arange(int(seconds * sr)) / sr
+    def voiced(f0):
+        phase = 2 * np.pi * np.cumsum(np.broadcast_to(f0, t.shape)) / sr
+        return sum(a * np.sin(k * phase) for k, a in ((1, 0.3), (2, 0.15), (3, 0.08), (4, 0.04)))
+    for f in (100, 150, 220, 300):
+        yield f"tone {f} Hz", voiced(f).astype(np.float32), float(f)
+    glide = 120 + 180 * t / seconds
+    yield "glide 120→300 Hz", voiced(glide).astype(np.float32), float(glide.mean())
+    gated = voiced(180) * (np.sin(2 * np.pi * 0.5 * t) > -0.3)
+    noise = 0.002 * np.random.default_rng(0).standard_normal(len(t))
+    yield "180 Hz, 40% silence", (gated + noise).astype(np.float32), 180.0
+
+def measure(backend, y, sr, repeats):
+    S = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP))
+    fn = PITCH_BACKENDS[backend]
+    fn(y, sr, S)                                  # JIT / FFT plan warm-up
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter(); pv = fn(y, sr, S); times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(y, sr, S)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return pv, {"ms": round(1000 * float(np.median(times)), 2), "peak_mb": round(peak / 2**20, 2),
+                "values": int(len(pv)),
+                "pitch_mean":  round(float(np.mean(pv)), 1) if len(pv) else 0.0,
+                "pitch_std":   round(float(np.std(pv)), 1)  if len(pv) else 0.0,
+                "pitch_range": round(float(np.ptp(pv)), 1)  if len(pv) else 0.0}
+
+def run(clips, repeats=5):
+    rows = []
+    for name, y, truth in clips:
+        row = {"clip": name, "seconds": round(len(y) / SR, 1), "true_f0": truth}
+        for backend in PITCH_BACKENDS:
+            _, row[backend] = measure(backend, y, SR, repeats)
+            if truth is not None: row[backend]["abs_err_hz"] = round(abs(row[backend]["pitch_mean"] - truth), 1)
+            row[backend]["emotion"] = classify_emotion(features_from_signal(y, SR, backend))[0]
+        row["speedup"] = round(row["piptrack"]["ms"] / max(row["yin"]["ms"], 1e-9), 1)
+        row["memory_ratio"] = round(row["piptrack"]["peak_mb"] / max(row["yin"]["peak_mb"], 1e-9), 1)
+        rows.append(row)
+    return rows
+
+def print_table(rows):
+    print(f"{'clip':22} {'true':>6} | {'piptrack ms':>11} {'MB':>6} {'mean':>7} {'std':>7} | "
+          f"{'yin ms':>7} {'MB':>6} {'mean':>7} {'std':>7} | {'speedup':>7} {'mem':>5} label")
+    for r in rows:
+        p, y = r["piptrack"], r["yin"]
+        truth = f"{r['true_f0']:.0f}" if r["true_f0"] is not None else "—"
+        same = "same" if p["emotion"] == y["emotion"] else f"{p['emotion']}→{y['emotion']}"
+        print(f"{r['clip'][:22]:22} {truth:>6} | {p['ms']:>11} {p['peak_mb']:>6} {p['pitch_mean']:>7} {p['pitch_std']:>7} | "
+              f"{y['ms']:>7} {y['peak_mb']:>6} {y['pitch_mean']:>7} {y['pitch_std']:>7} | "
+              f"{r['speedup']:>6}x {r['memory_ratio']:>4}x {same}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("speech", nargs="*", help="real speech recordings to include")
+    ap.add_argument("--librosa-example", action="store_true", help="add librosa.ex('libri1')")
+    ap.add_argument("--repeats", type=int, default=5)
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    clips = list(synthetic_cases())
+    paths = args.speech + ([librosa.ex("libri1")] if args.librosa_example else [])
+    for path in paths:
+        y, _ = librosa.load(path, sr=SR)
+        clips.append((os.path.basename(path), y, None))
+    rows = run(clips, args.repeats)
+    print(json.dumps(rows, indent=2, ensure_ascii=False)) if args.json else print_table(rows)
@@ -0,0 +1,161 @@
+"""End-to-end benchmark: per-stage timing and peak memory, with regression gates.
+
+Runs extract_features stage by stage (decode, stft, rms, zcr, vad, mel, mfcc, pitch,
+tempo, centroid, contrast), then classify_emotion and the chart builders. The inputs are
+deterministic synthetic speech-like clips at several durations and sample rates.
+Results can be saved as a baseline and later runs compared against it. The exit
+status is 1 when any stage slows down by more than the allowed ratio.
+
+    python benchmarks/suite.py                                  # table
+    python benchmarks/suite.py --save benchmarks/baseline.json  # record a baseline
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --max-slowdown 1.3
+
+Compare only against a baseline recorded on the same machine.
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+import librosa
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import STAGES, classify_emotion, extract_features, get_cache, load_envelope
+from charts import waveform_chart, confidence_chart, timeline_chart
+
+DURATIONS    = (2.0, 5.0, 10.0)
+SAMPLE_RATES = (8000, 16000, 44100)
+EXTRA        = ("classify", "waveform_chart", "confidence_chart", "timeline_chart")
+
+def speech_like(seconds, sr, seed=0):
+    # Voiced harmonic source with a wandering f0 and ~4 syllables/s, pauses between
+    # phrases, a crude two-formant tilt and a low noise floor. It is deterministic
+    # for a given (seconds, sr, seed).
+    rng = np.random.default_rng(seed)
+    t   = np.arange(int(seconds * sr)) / sr
+    f0  = 150 + 30 * np.sin(2 * np.pi * 0.3 * t) + 10 * np.sin(2 * np.pi * 5.5 * t)
+    ph  = 2 * np.pi * np.cumsum(f0) / sr
+    src = sum(np.sin(k * ph) / k * (1 + 0.8 * np.exp(-((k * 150 - 700) / 300)**2)
+                                     + 0.5 * np.exp(-((k * 150 - 1800) / 500)**2))
+              for k in range(1, 16) if k * 180 < sr / 2)
+    syll   = np.clip(np.sin(2 * np.pi * 4 * t + rng.uniform(0, 2 * np.pi)), 0, None)**0.6
+    phrase = (np.sin(2 * np.pi * 0.25 * t) > -0.6).astype(float)
+    y = 0.25 * src * syll * phrase + 0.003 * rng.standard_normal(len(t))
+    return y.astype(np.float32)
+
+def wav_bytes(y, sr):
+    buf = io.BytesIO()
+    sf.write(buf, y, sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+class StageTimer:
+    # stage(name) hook for extract_features: accumulates wall time per stage
+    def __init__(self): self.ms = {}
+
+    @contextmanager
+    def __call__(self, name):
+        t0 = time.perf_counter()
+        try: yield
+        finally: self.ms[name] = self.ms.get(name, 0.0) + 1000 * (time.perf_counter() - t0)
+
+def timed(fn, *args):
+    t0 = time.perf_counter(); out = fn(*args)
+    return out, 1000 * (time.perf_counter() - t0)
+
+def run_once(audio_bytes):
+    timer = StageTimer()
+    features, error = extract_features(audio_bytes, use_cache=False, stage=timer)
+    if error: raise RuntimeError(error)
+    ms = dict(timer.ms)
+    (emotion, probs), ms["classify"] = timed(classify_emotion, features)
+    _, ms["waveform_chart"]   = timed(lambda: waveform_chart(load_envelope(audio_bytes)))
+    _, ms["confidence_chart"] = timed(confidence_chart, probs)
+    windows = [{"start": 5.0 * i, "end": 5.0 * i + 10, "emotion": emotion, "confidence": 50.0} for i in range(24)]
+    _, ms["timeline_chart"]   = timed(timeline_chart, windows)
+    return ms, emotion
+
+def peak_mb(audio_bytes):
+    tracemalloc.start()
+    extract_features(audio_bytes, use_cache=False)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return round(peak / 2**20, 2)
+
+def bench_case(seconds, sr, repeats):
+    audio_bytes = wav_bytes(speech_like(seconds, sr), sr)
+    samples = []
+    for _ in range(repeats):
+        get_cache().clear()                        # waveform_chart would otherwise hit the decode cache
+        ms, emotion = run_once(audio_bytes)
+        samples.append(ms)
+    stages = {k: round(float(np.median([s.get(k, 0.0) for s in samples])), 2) for k in STAGES + EXTRA}
+    return {"case": f"{seconds:g}s@{sr}", "seconds": seconds, "sr": sr, "emotion": emotion,
+            "stages_ms": stages, "total_ms": round(sum(stages.values()), 2), "peak_mb": peak_mb(audio_bytes)}
+
+def run(durations=DURATIONS, rates=SAMPLE_RATES, repeats=5):
+    run_once(wav_bytes(speech_like(1.0, 22050), 22050))   # numba JIT / FFT plan warm-up
+    return {"meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count(),
+                     "numpy": np.__version__, "librosa": librosa.__version__, "repeats": repeats},
+            "cases": [bench_case(d, sr, repeats) for sr in rates for d in durations]}
+
+def compare(result, baseline, max_slowdown=1.25, max_mem_growth=1.25, min_ms=1.0):
+    # A stage regresses when it is both > max_slowdown × baseline and more than
+    # min_ms slower in absolute terms, so sub-millisecond jitter never fails the gate.
+    # Cases and stages the baseline lacks fail too: they could never regress otherwise,
+    # so a baseline recorded before a stage was added or split must be re-recorded.
+    base = {c["case"]: c for c in baseline["cases"]}
+    regressions = []
+    for case in result["cases"]:
+        old = base.get(case["case"])
+        if old is None:
+            regressions.append(f"{case['case']:>12} {'(whole case)':<16} not in the baseline")
+            continue
+        for k, ms in list(case["stages_ms"].items()) + [("total", case["total_ms"])]:
+            was = old["total_ms"] if k == "total" else old["stages_ms"].get(k)
+            if was is None:
+                regressions.append(f"{case['case']:>12} {k:<16} not in the baseline ({ms:.2f} ms now)")
+                continue
+            if ms > was * max_slowdown and ms - was > min_ms:
+                regressions.append(f"{case['case']:>12} {k:<16} {was:>8.2f} → {ms:>8.2f} ms ({ms / max(was, 1e-9):.2f}x)")
+        if case["peak_mb"] > old["peak_mb"] * max_mem_growth:
+            regressions.append(f"{case['case']:>12} {'peak memory':<16} {old['peak_mb']:>8.2f} → {case['peak_mb']:>8.2f} MB")
+    return regressions
+
+def print_table(result):
+    cols = STAGES + EXTRA
+    short = {"waveform_chart": "wave", "confidence_chart": "conf", "timeline_chart": "tline", "centroid": "cent",
+             "contrast": "contr", "classify": "class"}
+    print(f"{'case':>12} " + " ".join(f"{short.get(k, k):>7}" for k in cols) + f" {'total':>8} {'MB':>7} label")
+    for c in result["cases"]:
+        print(f"{c['case']:>12} " + " ".join(f"{c['stages_ms'][k]:>7.2f}" for k in cols)
+              + f" {c['total_ms']:>8.2f} {c['peak_mb']:>7.2f} {c['emotion']}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--durations", type=float, nargs="+", default=DURATIONS, help="clip lengths in seconds")
+    ap.add_argument("--rates", type=int, nargs="+", default=SAMPLE_RATES, help="source sample rates")
+    ap.add_argument("--repeats", type=int, default=5, help="runs per case; the median is reported")
+    ap.add_argument("--save", metavar="PATH", help="write the result as a baseline JSON")
+    ap.add_argument("--baseline", metavar="PATH", help="compare against a stored baseline JSON")
+    ap.add_argument("--max-slowdown", type=float, default=1.25, help="allowed time ratio per stage (default 1.25)")
+    ap.add_argument("--max-mem-growth", type=float, default=1.25, help="allowed peak memory ratio (default 1.25)")
+    ap.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns smaller than this (default 1 ms)")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    result = run(tuple(args.durations), tuple(args.rates), args.repeats)
+    print(json.dumps(result, indent=2)) if args.json else print_table(result)
+    if args.save:
+        with open(args.save, "w") as fh: json.dump(result, fh, indent=2); fh.write("\n")
+    if args.baseline:
+        with open(args.baseline) as fh: baseline = json.load(fh)
+        regressions = compare(result, baseline, args.max_slowdown, args.max_mem_growth, args.min_ms)
+        print(f"\n{len(regressions)} regression(s) vs {args.baseline}", file=sys.stderr)
+        for line in regressions: print("  " + line, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
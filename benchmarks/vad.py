@@ -0,0 +1,67 @@
+"""Voice-activity gating benchmark: features_from_signal with vad off vs on.
+
+Pads a speech-like clip with low-level noise so that 0–70% of it is silence, then
+measures extraction time for both settings, the speech_ratio the gate finds, and
+how far the energy / pitch / zcr statistics move once silence stops diluting them.
+
+    python benchmarks/vad.py
+    python benchmarks/vad.py --silence 0 0.5 0.8 --pitch yin --json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR, DEFAULT_PITCH, features_from_signal
+from suite import speech_like
+
+SILENCE = (0.0, 0.3, 0.5, 0.7)
+SHOWN   = ("rms_mean", "pitch_mean", "pitch_std", "zcr", "spec_cent")
+
+def padded(speech_seconds, silence, sr=SR, seed=0):
+    # speech_like clip with noise-floor padding split before and after it
+    y   = speech_like(speech_seconds, sr, seed)
+    pad = int(len(y) * silence / (1 - silence)) if silence else 0
+    rng = np.random.default_rng(seed + 1)
+    return np.concatenate([0.002 * rng.standard_normal(pad // 2), y,
+                           0.002 * rng.standard_normal(pad - pad // 2)]).astype(np.float32)
+
+def timed(y, sr, pitch, vad, repeats):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter(); f = features_from_signal(y, sr, pitch, vad=vad); times.append(time.perf_counter() - t0)
+    return f, round(1000 * float(np.median(times)), 2)
+
+def run(silences=SILENCE, speech_seconds=3.0, pitch=DEFAULT_PITCH, repeats=5):
+    features_from_signal(padded(1.0, 0.5), SR, pitch, vad=True)   # numba JIT / FFT plan warm-up
+    rows = []
+    for s in silences:
+        y = padded(speech_seconds, s)
+        off, off_ms = timed(y, SR, pitch, False, repeats)
+        on,  on_ms  = timed(y, SR, pitch, True, repeats)
+        rows.append({"silence": s, "seconds": round(len(y) / SR, 2), "speech_ratio": round(on["speech_ratio"], 3),
+                     "off_ms": off_ms, "on_ms": on_ms, "saved": round(1 - on_ms / off_ms, 3),
+                     "off": {k: round(off[k], 4) for k in SHOWN}, "on": {k: round(on[k], 4) for k in SHOWN}})
+    return rows
+
+def print_table(rows):
+    print(f"{'silence':>7} {'secs':>5} {'speech':>6} | {'off ms':>7} {'on ms':>7} {'saved':>6} | "
+          + " ".join(f"{k:>21}" for k in SHOWN))
+    for r in rows:
+        print(f"{r['silence']:>7.0%} {r['seconds']:>5} {r['speech_ratio']:>6.0%} | "
+              f"{r['off_ms']:>7} {r['on_ms']:>7} {r['saved']:>6.0%} | "
+              + " ".join(f"{r['off'][k]:>10.4g}→{r['on'][k]:<10.4g}" for k in SHOWN))
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--silence", type=float, nargs="+", default=SILENCE, help="fraction of each clip that is silence")
+    ap.add_argument("--speech-seconds", type=float, default=3.0, help="length of the speech part")
+    ap.add_argument("--pitch", default=DEFAULT_PITCH, help="pitch backend (default: $VOXSENSE_PITCH or piptrack)")
+    ap.add_argument("--repeats", type=int, default=5, help="runs per case; the median is reported")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    rows = run(tuple(args.silence), args.speech_seconds, args.pitch, args.repeats)
+    print(json.dumps(rows, indent=2)) if args.json else print_table(rows)
@@ -0,0 +1,82 @@
+"""Waveform chart benchmark: strided decimation vs min/max envelope pyramid.
+
+For recordings of growing length it measures:
+  - the old chart: y[::step] over the decoded samples
+  - a pyramid view: the full recording and a 10 s zoom, both from a prebuilt EnvelopePyramid
+  - the one-off pyramid build and its size
+  - the Plotly JSON payload size
+  - how much of the true peak each chart keeps (sparse 2 ms clicks)
+
+    python benchmarks/waveform.py
+    python benchmarks/waveform.py --minutes 0.5 5 60 --json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import EnvelopePyramid
+from charts import waveform_chart
+
+SR = 8000   # keeps a 60-minute signal at ~115 MB of float32
+
+def recording(minutes, sr=SR, seed=0):
+    # Low-level noisy speech band with sparse loud 2 ms clicks: the peaks striding drops
+    rng = np.random.default_rng(seed)
+    n = int(minutes * 60 * sr)
+    y = (0.05 * rng.standard_normal(n)).astype(np.float32)
+    for i in rng.integers(0, n - 16, max(1, n // (sr * 20))):
+        y[i:i + 16] += 0.9
+    return y
+
+def strided_chart(y, sr, color="#f97316"):
+    step = max(1, len(y)//700)
+    yd = y[::step]
+    t  = np.linspace(0, len(y)/sr, len(yd))
+    return go.Figure(go.Scatter(x=t, y=yd, mode="lines", line=dict(color=color, width=1.2), fill="tozeroy")), yd
+
+def ms(fn):
+    t0 = time.perf_counter(); out = fn()
+    return out, round(1000 * (time.perf_counter() - t0), 2)
+
+def run(minutes):
+    rows = []
+    for m in minutes:
+        y = recording(m)
+        true_peak = float(y.max())
+        (fig_s, yd), stride_ms = ms(lambda: strided_chart(y, SR))
+        pyr, build_ms = ms(lambda: EnvelopePyramid.from_signal(y, SR))
+        fig_f, full_ms = ms(lambda: waveform_chart(pyr))
+        mid = pyr.duration / 2
+        fig_z, zoom_ms = ms(lambda: waveform_chart(pyr, t0=mid, t1=mid + 10))
+        _, view_ms = ms(lambda: pyr.view(mid, mid + 10))
+        rows.append({"minutes": m, "samples": len(y),
+                     "stride_ms": stride_ms, "stride_kb": round(len(fig_s.to_json()) / 1024, 1),
+                     "stride_peak": round(float(yd.max()) / true_peak, 3),
+                     "build_ms": build_ms, "pyramid_mb": round(pyr.nbytes / 2**20, 2), "levels": len(pyr.levels),
+                     "full_ms": full_ms, "zoom_ms": zoom_ms, "view_ms": view_ms,
+                     "env_kb": round(len(fig_f.to_json()) / 1024, 1),
+                     "env_peak": round(float(pyr.view()[2].max()) / true_peak, 3)})
+        del y
+    return rows
+
+def print_table(rows):
+    print(f"{'min':>6} | {'stride ms':>9} {'KB':>6} {'peak':>5} | {'build ms':>8} {'MB':>6} {'lvls':>4} | "
+          f"{'full ms':>7} {'zoom ms':>7} {'view ms':>7} {'KB':>6} {'peak':>5}")
+    for r in rows:
+        print(f"{r['minutes']:>6.3g} | {r['stride_ms']:>9} {r['stride_kb']:>6} {r['stride_peak']:>5} | "
+              f"{r['build_ms']:>8} {r['pyramid_mb']:>6} {r['levels']:>4} | "
+              f"{r['full_ms']:>7} {r['zoom_ms']:>7} {r['view_ms']:>7} {r['env_kb']:>6} {r['env_peak']:>5}")
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--minutes", type=float, nargs="+", default=(1/6, 1, 10, 60), help="recording lengths")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = ap.parse_args()
+    waveform_chart(EnvelopePyramid.from_signal(recording(0.1), SR))   # plotly import / first-figure warm-up
+    rows = run(args.minutes)
+    print(json.dumps(rows, indent=2)) if args.json else print_table(rows)
@@ -0,0 +1,69 @@
+# Plotly figure builders for the Streamlit UI. Kept out of app.py so they can be
+# imported (and benchmarked) without starting a Streamlit script run.
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from voxsense import EMOTIONS
+
+def waveform_chart(pyramid, color="#f97316", t0=0.0, t1=None, points=700):
+    # Min/max envelope band from an EnvelopePyramid: payload is ≤ 2·points values
+    # and build time is flat whatever the recording length or zoom
+    try:
+        t, lo, hi = pyramid.view(t0, t1, points)
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=t, y=hi, mode="lines", line=dict(color=color, width=1), hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=t, y=lo, mode="lines", line=dict(color=color, width=1), hoverinfo="skip",
+            fill="tonexty", fillcolor=color+"40"))
+        fig.update_layout(
+            plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+            height=110, margin=dict(l=0,r=0,t=0,b=0),
+            showlegend=False, xaxis=dict(visible=False), yaxis=dict(visible=False))
+        return fig
+    except: return None
+
+def confidence_chart(probs):
+    pairs = sorted(zip([v*100 for v in probs.values()], probs.keys(),
+                       [EMOTIONS[e]["color"] for e in probs.keys()]), reverse=True)
+    vals, ems, cols = zip(*pairs)
+    fig = go.Figure(go.Bar(
+        x=list(vals), y=list(ems), orientation="h",
+        marker=dict(color=list(cols), opacity=0.85),
+        text=[f"{v:.1f}%" for v in vals],
+        textposition="outside", textfont=dict(color="#9b96a0", size=11, family="DM Mono"),
+    ))
+    fig.update_layout(
+        plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+        height=240, margin=dict(l=10,r=60,t=10,b=10), showlegend=False,
+        font=dict(color="#6b6570", family="DM Sans"),
+        xaxis=dict(range=[0,115], gridcolor="rgba(255,255,255,0.04)",
+                   ticksuffix="%", tickfont=dict(color="#4a4550",size=10)),
+        yaxis=dict(gridcolor="rgba(0,0,0,0)", tickfont=dict(color="#9b96a0",size=12)))
+    return fig
+
+def timeline_chart(timeline, hop=5.0):
+    fig = go.Figure(go.Bar(
+        x=[w["start"] + hop/2 for w in timeline], y=[w["confidence"] for w in timeline], width=hop*0.9,
+        marker=dict(color=[EMOTIONS[w["emotion"]]["color"] for w in timeline], opacity=0.85),
+        hovertext=[f"{w['emotion']} · {w['start']:.0f}–{w['end']:.0f}s" for w in timeline],
+        hoverinfo="text"))
+    fig.update_layout(
+        plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+        height=140, margin=dict(l=0,r=0,t=0,b=20), showlegend=False,
+        xaxis=dict(ticksuffix="s", gridcolor="rgba(0,0,0,0)", tickfont=dict(color="#4a4550",size=10)),
+        yaxis=dict(visible=False, range=[0,100]))
+    return fig
+
+def speaker_timeline_chart(rows, hop=5.0):
+    # channel_timeline rows as one timeline_chart lane per speaker on a shared time axis
+    labels = [c["label"] for c in rows[0]["channels"]]
+    fig = make_subplots(rows=len(labels), cols=1, shared_xaxes=True, vertical_spacing=0.08, subplot_titles=labels)
+    for i, label in enumerate(labels):
+        lane = [dict(c, start=r["start"], end=r["end"]) for r in rows for c in r["channels"] if c["label"] == label]
+        fig.add_trace(timeline_chart(lane, hop).data[0], row=i + 1, col=1)
+        fig.update_yaxes(visible=False, range=[0,100], row=i + 1, col=1)
+    fig.update_layout(
+        plot_bgcolor="rgba(0,0,0,0)", paper_bgcolor="rgba(0,0,0,0)",
+        height=110 * len(labels) + 20, margin=dict(l=0,r=0,t=20,b=20), showlegend=False,
+        font=dict(color="#6b6570", family="DM Sans", size=11))
+    fig.update_xaxes(ticksuffix="s", gridcolor="rgba(0,0,0,0)", tickfont=dict(color="#4a4550",size=10))
+    return fig
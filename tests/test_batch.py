@@ -0,0 +1,44 @@
+# Batch scoring with --resume: rows already scored are skipped, rows that failed are
+# retried and appended, and a line torn by a crash is cut off first.
+import io
+import os
+import csv
+import sys
+import json
+import numpy as np
+import soundfile as sf
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR
+from voxsense.batch import completed_paths, run_batch
+
+def tone(path, f0):
+    t = np.arange(SR) / SR
+    sf.write(path, (0.3 * np.sin(2 * np.pi * f0 * t) * (1 + np.sin(2 * np.pi * 3 * t)) / 2).astype(np.float32), SR)
+
+def rows(out):
+    with open(out, newline="", encoding="utf-8") as fh:
+        if out.endswith(".csv"): return list(csv.DictReader(fh))
+        return [json.loads(line) for line in fh]
+
+@pytest.mark.parametrize("ext", [".jsonl", ".csv"])
+def test_resume_skips_done_and_retries_errors(tmp_path, ext):
+    tone(tmp_path / "a.wav", 150); tone(tmp_path / "b.wav", 220)
+    manifest, out = tmp_path / "files.txt", str(tmp_path / ("out" + ext))
+    manifest.write_text("a.wav\nb.wav\nc.wav\n")             # c.wav doesn't exist yet: an error row
+    first = run_batch(str(manifest), out, workers=1, log=io.StringIO())
+    assert (first["ok"], first["errors"]) == (2, 1)
+    assert completed_paths(out) == {str(tmp_path / "a.wav"), str(tmp_path / "b.wav")}
+
+    with open(out, "a", encoding="utf-8") as fh: fh.write('{"path": "torn' if ext == ".jsonl" else "torn,Hin")
+    tone(tmp_path / "c.wav", 300)
+    second = run_batch(str(manifest), out, workers=1, resume=True, log=io.StringIO())
+    assert (second["ok"], second["errors"], second["skipped"]) == (1, 0, 2)
+    scored = rows(out)
+    assert [os.path.basename(r["path"]) for r in scored] == ["a.wav", "b.wav", "c.wav", "c.wav"]
+    assert scored[2]["error"] and not scored[3].get("error") and scored[3]["emotion"]
+
+    third = run_batch(str(manifest), out, workers=1, resume=True, log=io.StringIO())
+    assert (third["ok"], third["errors"], third["skipped"]) == (0, 0, 3)
+    assert len(rows(out)) == 4
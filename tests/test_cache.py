@@ -0,0 +1,46 @@
+# Audio cache: entries come back read-only from either tier, and memory stays within
+# its byte budget by evicting the least recently used entry.
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense.cache import AudioCache
+
+def entry(n, fill=1.0):
+    return {"y": np.full(n, fill, np.float32), "sr": 16000}
+
+def test_memory_hit_is_read_only():
+    cache = AudioCache()
+    cache.put("a", entry(10))
+    value = cache.get("a")
+    assert value["sr"] == 16000 and not value["y"].flags.writeable
+    with pytest.raises(ValueError): value["y"][0] = 0
+
+def test_disk_hit_is_read_only(tmp_path):
+    AudioCache(disk_dir=str(tmp_path)).put("a", entry(10, 2.0))
+    cache = AudioCache(disk_dir=str(tmp_path))                # a fresh process: memory tier empty
+    value = cache.get("a")
+    assert cache.stats()["disk_hits"] == 1 and value["sr"] == 16000
+    assert np.array_equal(value["y"], np.full(10, 2.0, np.float32)) and not value["y"].flags.writeable
+    with pytest.raises(ValueError): value["y"][0] = 0
+    assert not cache.get("a")["y"].flags.writeable           # now a memory hit on the same array
+    assert cache.stats()["hits"] == 1
+
+def test_lru_eviction():
+    cache = AudioCache(max_bytes=3 * 400 + 3 * 8)            # three 100-sample entries fit
+    for key in "abc": cache.put(key, entry(100))
+    cache.get("a")                                           # b is now the least recently used
+    cache.put("d", entry(100))
+    assert cache.get("b") is None and all(cache.get(k) is not None for k in "acd")
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 3 and stats["bytes"] <= stats["max_bytes"]
+    cache.put("big", entry(10_000))                          # larger than the budget: kept alone
+    assert cache.stats()["entries"] == 1 and cache.get("big") is not None
+
+def test_corrupt_disk_entry_is_a_miss(tmp_path):
+    cache = AudioCache(disk_dir=str(tmp_path))
+    with open(os.path.join(tmp_path, "a.npz"), "wb") as fh: fh.write(b"not an npz")
+    assert cache.get("a") is None and cache.stats()["misses"] == 1
+    assert not os.path.exists(os.path.join(tmp_path, "a.npz"))
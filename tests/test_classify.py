@@ -0,0 +1,76 @@
+# The vectorised rules (classify_batch / sweep_languages) must reproduce
+# classify_emotion exactly, including rows that sit on a threshold.
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import (LANGUAGES, DEFAULT_LANGUAGE, EMOTION_NAMES, FEATURE_COLUMNS, RULES, classify_emotion,
+                      classify_batch, feature_matrix, sweep_languages)
+
+TYPICAL = {"rms_mean": 0.05, "pitch_mean": 200.0, "pitch_range": 100.0, "zcr": 0.05, "rms_std": 0.03,
+           "spec_cent": 2000.0, "contrast": 20.0, "tempo": 110.0}
+
+def threshold_rows():
+    # Every feature on, just below and just above each of its thresholds, raw and (for the
+    # calibrated pitch_mean / rms_mean) at the raw value that calibrates onto the threshold
+    rows = []
+    for feature, branches in RULES:
+        for _, threshold, _ in branches:
+            if threshold is None: continue
+            values = [threshold, np.nextafter(threshold, -np.inf), np.nextafter(threshold, np.inf)]
+            for cfg in LANGUAGES.values():
+                if feature == "pitch_mean": values.append(threshold + cfg["offset"])
+                if feature == "rms_mean":   values.append(threshold / cfg["scale"])
+            rows += [{**TYPICAL, feature: float(v)} for v in values]
+    return rows
+
+def special_rows():
+    rows = [{**TYPICAL, "pitch_mean": 0.0, "pitch_range": 0.0},
+            {**TYPICAL, "pitch_mean": -5.0},
+            {c: 0.0 for c in FEATURE_COLUMNS},
+            {c: np.nan for c in FEATURE_COLUMNS}]
+    rows += [{**TYPICAL, c: np.nan} for c in FEATURE_COLUMNS]
+    return rows
+
+def random_rows(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    hi  = {"rms_mean": 0.2, "pitch_mean": 500, "pitch_range": 400, "zcr": 0.15, "rms_std": 0.08,
+           "spec_cent": 5000, "contrast": 40, "tempo": 200}
+    return [{c: float(rng.uniform(0, hi[c])) for c in FEATURE_COLUMNS} for _ in range(n)]
+
+ROWS  = threshold_rows() + special_rows() + random_rows()
+LANGS = list(LANGUAGES)
+
+def scalar(rows, langs):
+    return np.array([[classify_emotion(r, lang)[1][e] for e in EMOTION_NAMES] for r, lang in zip(rows, langs)])
+
+def test_batch_matches_scalar_per_row_languages():
+    langs = [LANGS[i % len(LANGS)] for i in range(len(ROWS))]
+    P = classify_batch(feature_matrix(ROWS), langs)
+    assert np.array_equal(P, scalar(ROWS, langs))
+
+@pytest.mark.parametrize("lang", LANGS)
+def test_batch_matches_scalar_one_language(lang):
+    assert np.array_equal(classify_batch(feature_matrix(ROWS), lang), scalar(ROWS, [lang] * len(ROWS)))
+
+def test_sweep_matches_scalar():
+    A = sweep_languages(feature_matrix(ROWS))
+    assert A.shape == (len(LANGS), len(ROWS), len(EMOTION_NAMES))
+    for lang, P in zip(LANGS, A):
+        assert np.array_equal(P, scalar(ROWS, [lang] * len(ROWS))), lang
+
+def test_short_language_names():
+    X = feature_matrix(ROWS[:50])
+    assert np.array_equal(classify_batch(X, "bengali"), classify_batch(X, "Bengali (বাংলা)"))
+
+def test_unknown_language():
+    # Deliberate difference: the scalar path (kept for the app) falls back to Hindi,
+    # while the batch paths raise rather than silently mis-calibrate a corpus
+    row = ROWS[0]
+    assert classify_emotion(row, "Klingon") == classify_emotion(row, DEFAULT_LANGUAGE)
+    with pytest.raises(KeyError):
+        classify_batch(feature_matrix([row]), "Klingon")
+    with pytest.raises(KeyError):
+        sweep_languages(feature_matrix([row]), ["Hindi", "Klingon"])
@@ -0,0 +1,54 @@
+# Equivalence of the single-STFT feature graph with the original extractor, which
+# ran separate mfcc(y=) / piptrack(y=) / beat_track(y=) passes on the raw signal.
+import io
+import os
+import sys
+import numpy as np
+import soundfile as sf
+import librosa
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import extract_features
+
+def baseline_features(audio_bytes):
+    # The extractor as it was before the shared STFT, kept verbatim as the reference
+    y, sr      = librosa.load(io.BytesIO(audio_bytes), sr=22050, duration=10)
+    mfcc       = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=40)
+    pitches, _ = librosa.piptrack(y=y, sr=sr)
+    pv = pitches[pitches > 0]
+    rms        = librosa.feature.rms(y=y)
+    tempo, _   = librosa.beat.beat_track(y=y, sr=sr)
+    return {
+        "mfcc_mean":   np.mean(mfcc, axis=1),
+        "pitch_mean":  float(np.mean(pv))   if len(pv) else 0.0,
+        "pitch_std":   float(np.std(pv))    if len(pv) else 0.0,
+        "pitch_range": float(np.ptp(pv))    if len(pv) else 0.0,
+        "rms_mean":    float(np.mean(rms)),
+        "rms_std":     float(np.std(rms)),
+        "rms_max":     float(np.max(rms)),
+        "zcr":         float(np.mean(librosa.feature.zero_crossing_rate(y))),
+        "spec_cent":   float(np.mean(librosa.feature.spectral_centroid(y=y, sr=sr))),
+        "contrast":    float(np.mean(librosa.feature.spectral_contrast(y=y, sr=sr))),
+        "tempo":       float(np.squeeze(tempo)),
+        "duration":    len(y)/sr,
+    }
+
+def clip(sr, seconds=3.0, seed=0):
+    # Vibrato tone with a syllable-rate envelope and a little noise, as WAV bytes
+    rng = np.random.default_rng(seed)
+    t   = np.arange(int(sr * seconds)) / sr
+    y   = (0.3 * np.sin(2*np.pi*(180 + 40*np.sin(2*np.pi*3*t))*t) * (0.5 + 0.5*np.sin(2*np.pi*2*t))
+           + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+    buf = io.BytesIO()
+    sf.write(buf, y, sr, format="WAV")
+    return buf.getvalue()
+
+@pytest.mark.parametrize("sr", [8000, 16000, 22050, 44100])
+def test_matches_baseline(sr):
+    audio_bytes = clip(sr, seed=sr)
+    expected    = baseline_features(audio_bytes)
+    features, error = extract_features(audio_bytes, use_cache=False, pitch="piptrack", profile="hq", vad=False)
+    assert error is None
+    for k, v in expected.items():
+        assert np.allclose(features[k], v, rtol=1e-5, atol=1e-8), k
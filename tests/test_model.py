@@ -0,0 +1,57 @@
+# Trained models: saving and reloading, in either format, must not change a single
+# probability, whether the model saw two emotions or four.
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import EMOTION_NAMES, FEATURE_COLUMNS, EmotionModel, fit_model, model_matrix
+
+SPREAD = {"rms_mean": 0.05, "pitch_mean": 200.0, "pitch_range": 100.0, "zcr": 0.05, "rms_std": 0.03,
+          "spec_cent": 2000.0, "contrast": 20.0, "tempo": 110.0}
+
+def rows(n, seed):
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n):
+        row = {c: float(SPREAD[c] * rng.uniform(0.3, 2.0)) for c in FEATURE_COLUMNS}
+        row["mfcc_mean"] = rng.normal(0, 20, 40)
+        out.append(row)
+    return out
+
+def labelled(n_classes):
+    train  = rows(200, 0)
+    # Labels that depend on the features, so every class gets a real decision region
+    score  = np.array([r["pitch_mean"] / SPREAD["pitch_mean"] + r["mfcc_mean"][0] / 20 for r in train])
+    edges  = np.quantile(score, np.linspace(0, 1, n_classes + 1)[1:-1])
+    labels = [EMOTION_NAMES[i] for i in np.searchsorted(edges, score)]
+    return train, labels
+
+@pytest.mark.parametrize("n_classes", [2, 4])
+@pytest.mark.parametrize("ext", ["npz", "joblib"])
+def test_round_trip_is_bit_identical(tmp_path, n_classes, ext):
+    train, labels = labelled(n_classes)
+    model = fit_model(train, labels)
+    path  = str(tmp_path / f"model.{ext}")
+    model.save(path)
+    loaded = EmotionModel.load(path)
+    test   = rows(50, 1)
+    X      = model_matrix(test)
+    assert loaded.columns == model.columns and loaded.features == model.features
+    assert list(loaded.estimator.classes_) == list(model.estimator.classes_) and len(model.estimator.classes_) == n_classes
+    assert np.array_equal(loaded.estimator.predict_proba(X), model.estimator.predict_proba(X))
+    assert np.array_equal(loaded.classify_batch(test), model.classify_batch(test))
+    assert loaded.classify(test[0]) == model.classify(test[0])
+    unseen = [e for e in EMOTION_NAMES if e not in set(labels)]
+    assert all(p == 0 for e, p in loaded.classify(test[0])[1].items() if e in unseen)
+
+def test_npz_refuses_other_estimators(tmp_path):
+    from sklearn.tree import DecisionTreeClassifier
+    train, labels = labelled(4)
+    model = fit_model(train, labels, estimator=DecisionTreeClassifier(random_state=0))
+    with pytest.raises(ValueError): model.save(str(tmp_path / "model.npz"))
+    model.save(str(tmp_path / "model.joblib"))
+    X = model_matrix(rows(20, 1))
+    assert np.array_equal(EmotionModel.load(str(tmp_path / "model.joblib")).estimator.predict_proba(X),
+                          model.estimator.predict_proba(X))
@@ -0,0 +1,56 @@
+# Inference server without sockets: the micro-batcher isolates a bad row, admission
+# control answers 429 once max_pending requests are in flight, error bodies never
+# carry an exception's text, and /metrics is the format its content type says.
+import os
+import sys
+import json
+import asyncio
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import DEFAULT_LANGUAGE, EMOTION_NAMES
+from voxsense.metrics import CONTENT_TYPE, Metrics
+from voxsense.server import InferenceServer, MicroBatcher, _response
+
+GOOD = {"rms_mean": 0.05, "pitch_mean": 200.0, "pitch_range": 100.0, "zcr": 0.05, "rms_std": 0.03,
+        "spec_cent": 2000.0, "contrast": 20.0, "tempo": 110.0}
+
+def test_batch_falls_back_per_row():
+    async def go():
+        batcher = MicroBatcher(max_wait=0.01)
+        task    = asyncio.create_task(batcher.run())
+        results = await asyncio.gather(batcher.classify(GOOD, DEFAULT_LANGUAGE),
+                                       batcher.classify({"pitch_mean": 200.0}, DEFAULT_LANGUAGE),
+                                       batcher.classify(GOOD, DEFAULT_LANGUAGE), return_exceptions=True)
+        task.cancel()
+        return batcher, results
+    batcher, (a, bad, b) = asyncio.run(go())
+    assert batcher.batches == 1 and batcher.rows == 3        # all three arrived in one window
+    assert isinstance(bad, KeyError)
+    assert a == b and a[0] in EMOTION_NAMES and sum(a[1].values()) == pytest.approx(1.0)
+
+def test_full_queue_gets_429():
+    async def go():
+        server = InferenceServer(max_pending=1, warm=False)
+        body   = json.dumps({"features": GOOD}).encode()
+        held   = asyncio.create_task(server._route("POST", "/v1/classify", body))   # no batcher: stays in flight
+        await asyncio.sleep(0)
+        status, payload = await server._route("POST", "/v1/classify", body)
+        held.cancel()
+        return server, status, payload
+    server, status, payload = asyncio.run(go())
+    assert status == 429 and payload["pending"] == 1 and server.rejected == 1
+
+def test_errors_hide_exception_text():
+    async def go():
+        server = InferenceServer(warm=False)
+        return await server._route("POST", "/v1/analyse", b"not audio at all")
+    status, payload = asyncio.run(go())
+    assert (status, payload) == (422, {"error": "could not decode audio"})
+
+def test_metrics_match_content_type():
+    metrics = Metrics()
+    metrics.observe("pitch", 0.02)
+    head, body = _response(200, metrics.render(), True).split(b"\r\n\r\n", 1)
+    assert f"Content-Type: {CONTENT_TYPE}".encode() in head and "version=0.0.4" in CONTENT_TYPE
+    assert b'voxsense_stage_seconds_count{stage="pitch"} 1' in body and b"# EOF" not in body
@@ -0,0 +1,64 @@
+# Feature store: rows survive a reopen, torn writes are cut off, and writers sharing
+# a store never hand out the same row twice.
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import FEATURE_COLUMNS, FeatureStore, StoreMismatch
+from voxsense.store import COLUMNS, N_MFCC
+
+def row(seed):
+    rng = np.random.default_rng(seed)
+    features = {c: float(v) for c, v in zip(COLUMNS, rng.uniform(0, 100, len(COLUMNS)))}
+    features["mfcc_mean"] = rng.standard_normal(N_MFCC).astype(np.float32)
+    return features
+
+def same(a, b):
+    return list(a) == list(b) and all(np.array_equal(a[k], b[k]) for k in a)
+
+def test_append_and_reopen(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    assert [store.add(b"a%d" % i, row(i)) for i in range(3)] == [0, 1, 2]
+    assert store.add(b"a1", row(9)) == 1                     # already stored: not appended again
+    again = FeatureStore(str(tmp_path), readonly=True)
+    assert len(again) == 3 and b"a2" in again and b"b" not in again
+    for i in range(3): assert same(again.get(b"a%d" % i), row(i))
+    assert again.matrix().shape == (3, len(FEATURE_COLUMNS))
+    with pytest.raises(PermissionError): again.add(b"b", row(3))
+
+def test_torn_tail_is_truncated(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.add(b"a0", row(0)); store.add(b"a1", row(1))
+    # A writer that died mid-row: values written, key never made it
+    with open(os.path.join(tmp_path, "scalars.f8"), "ab") as fh: fh.write(b"\0" * 8 * 5)
+    with open(os.path.join(tmp_path, "keys.bin"), "ab") as fh: fh.write(b"\1" * 7)
+    store = FeatureStore(str(tmp_path))
+    assert len(store) == 2
+    assert os.path.getsize(os.path.join(tmp_path, "scalars.f8")) == 2 * 8 * len(COLUMNS)
+    assert os.path.getsize(os.path.join(tmp_path, "keys.bin")) == 2 * 32
+    assert store.add(b"a2", row(2)) == 2
+    for i in range(3): assert same(store.get(b"a%d" % i), row(i))
+
+def test_writers_interleave(tmp_path):
+    a, b = FeatureStore(str(tmp_path)), FeatureStore(str(tmp_path))
+    assert a.add(b"a1", row(1)) == 0
+    assert b.add(b"b1", row(2)) == 1
+    assert a.add(b"a2", row(3)) == 2
+    assert b.add(b"a2", row(3)) == 2                         # b learns of a's row instead of duplicating it
+    reader = FeatureStore(str(tmp_path), readonly=True)
+    for store in (a, b, reader):
+        assert same(store.get(b"a1"), row(1)) and same(store.get(b"b1"), row(2)) and same(store.get(b"a2"), row(3))
+    assert len(reader) == 3
+
+def test_mismatch(tmp_path):
+    store = FeatureStore(str(tmp_path), pitch="yin", profile="phone", vad=True)
+    store.check("yin", "phone", True)
+    with pytest.raises(StoreMismatch): store.check("piptrack", "phone", True)
+    with pytest.raises(StoreMismatch): store.check("yin", "phone", False)
+    meta = os.path.join(tmp_path, "meta.json")
+    with open(meta) as fh: text = fh.read()
+    with open(meta, "w") as fh: fh.write(text.replace('"n_mfcc": 40', '"n_mfcc": 20'))
+    with pytest.raises(StoreMismatch): FeatureStore(str(tmp_path))
+    with pytest.raises(FileNotFoundError): FeatureStore(str(tmp_path / "missing"), readonly=True)
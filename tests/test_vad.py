@@ -0,0 +1,62 @@
+# Voice-activity gating: clips with no speech must not count as speech, and the
+# pauses in real speech must be found.
+import os
+import sys
+import numpy as np
+import librosa
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voxsense import SR, HOP, N_FFT, features_from_signal, speech_mask
+
+def voiced(seconds, seed=0):
+    # Harmonic source at ~150 Hz with a 4 Hz syllable envelope and a low noise floor
+    rng = np.random.default_rng(seed)
+    t   = np.arange(int(seconds * SR)) / SR
+    ph  = 2 * np.pi * np.cumsum(150 + 20 * np.sin(2 * np.pi * 0.5 * t)) / SR
+    src = sum(np.sin(k * ph) / k for k in range(1, 10))
+    syl = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.6
+    return (0.2 * src * (0.3 + 0.7 * syl) + 0.002 * rng.standard_normal(len(t))).astype(np.float32)
+
+def ratio(y):
+    return features_from_signal(y, SR, vad=True, want=("speech_ratio",))["speech_ratio"]
+
+def mask(y):
+    rms = librosa.feature.rms(y=y, frame_length=N_FFT, hop_length=HOP)[0]
+    zcr = librosa.feature.zero_crossing_rate(y)[0]
+    return speech_mask(rms, zcr)
+
+T   = np.arange(3 * SR) / SR
+RNG = np.random.default_rng(1)
+
+@pytest.mark.parametrize("name, y", [
+    ("digital silence", np.zeros(3 * SR, np.float32)),
+    ("-60 dBFS white noise", (0.001 * RNG.standard_normal(3 * SR)).astype(np.float32)),
+    ("-20 dBFS white noise", (0.1 * RNG.standard_normal(3 * SR)).astype(np.float32)),
+    ("50 Hz hum", (0.1 * np.sin(2 * np.pi * 50 * T)).astype(np.float32)),
+])
+def test_no_speech(name, y):
+    assert not mask(y).any(), name
+    assert ratio(y) == 0.0, name
+
+def test_no_speech_is_analysed_ungated():
+    # Too few speech frames to gate on: the features are those of the whole clip
+    y = (0.1 * np.sin(2 * np.pi * 50 * T)).astype(np.float32)
+    gated, plain = features_from_signal(y, SR, vad=True), features_from_signal(y, SR, vad=False)
+    for k in plain: assert np.array_equal(gated[k], plain[k]), k
+
+def test_speech_with_pauses():
+    # 2 s speech, 1 s silence, 2 s speech, 1 s low-level noise
+    noise = (0.001 * np.random.default_rng(2).standard_normal(SR)).astype(np.float32)
+    y     = np.concatenate([voiced(2, 0), np.zeros(SR, np.float32), voiced(2, 1), noise])
+    m     = mask(y)
+    frame = lambda seconds: int(seconds * SR / HOP)
+    pad   = 7                                        # hangover plus the centred frame's reach
+    assert m[frame(0.1):frame(1.9)].mean() > 0.9
+    assert not m[frame(2) + pad:frame(3) - pad].any()
+    assert m[frame(3.1):frame(4.9)].mean() > 0.9
+    assert not m[frame(5) + pad:].any()
+    assert abs(ratio(y) - 4 / 6) < 0.1                  # the hangover widens each speech run a little
+
+def test_continuous_speech_is_not_gated_away():
+    assert ratio(voiced(3)) > 0.9
@@ -0,0 +1,25 @@
+import time as _time
+_t0 = _time.perf_counter()
+
+from .classify import (EMOTIONS, LANGUAGES, DEFAULT_LANGUAGE, EMOTION_NAMES, FEATURE_COLUMNS, RULES,
+                       resolve_language, classify_emotion, feature_matrix, calibration,
+                       score_matrix, classify_batch, sweep_languages, top_emotions)
+from .features import (N_FFT, HOP, SR, MAX_DURATION, DEFAULT_PITCH, DEFAULT_VAD, SCALARS, STAGES, load_audio,
+                       extract_features, features_from_signal, FEATURES, NODES, OUTPUTS, plan)
+from .cache import AudioCache, get_cache
+from .metrics import METRICS_FILE, Metrics, get_metrics, stage_timer
+from .audio import PROFILES, DEFAULT_PROFILE, Profile, get_profile, conform, decode
+from .pitch import PITCH_BACKENDS, yin_track
+from .vad import speech_mask
+from .model import (MODEL_PATH, MODEL_COLUMNS, RuleClassifier, EmotionModel, model_matrix, column_matrix, fit_model,
+                    with_inputs, get_classifier)
+from .stream import duration_of, channels_of, iter_windows, analyse_stream
+from .channels import CHANNEL_LABELS, load_channels, analyse_signals, analyse_channels, channel_timeline
+from .realtime import FrameRing, IncrementalAnalyser
+from .envelope import EnvelopeBuilder, EnvelopePyramid, minmax, put_envelope, load_envelope
+from .store import FeatureStore, StoreMismatch
+from .session import HistoryRing, put_audio, get_audio, put_timeline, get_timeline, session_report
+from .jobs import STEPS, QueueFull, Cancelled, Job, JobQueue, get_jobs, analyse_upload
+from .warmup import WARMUP, warmup, start_warmup
+
+get_metrics().record_startup("import", _time.perf_counter() - _t0)
@@ -0,0 +1,218 @@
+import os
+import sys
+import argparse
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m voxsense",
+        description="Headless VoxSense tools — no Streamlit or Plotly required.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sc = sub.add_parser("score", help="score a directory or manifest of recordings")
+    sc.add_argument("source", help="directory of audio files, or a manifest "
+                    "(.csv with path[,language] columns, or one path per line)")
+    sc.add_argument("-o", "--out", default="-",
+                    help="results file, .csv or .jsonl (default: JSONL on stdout)")
+    sc.add_argument("-l", "--language", default="Hindi",
+                    help="calibration for rows without their own language (default: Hindi)")
+    sc.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                    help="worker processes (default: all cores)")
+    sc.add_argument("--chunksize", type=int, default=4, help="files handed to a worker at a time")
+    sc.add_argument("--resume", action="store_true",
+                    help="skip files already scored in --out and append to it; files that failed are retried")
+    sc.add_argument("--pitch", choices=("piptrack", "yin"),
+                    help="pitch backend (default: $VOXSENSE_PITCH or piptrack)")
+    sc.add_argument("--profile", choices=("hq", "balanced", "fast"),
+                    help="decode/resample profile (default: $VOXSENSE_PROFILE or hq)")
+    sc.add_argument("--vad", action="store_true", default=None,
+                    help="gate out silent frames before feature extraction (default: $VOXSENSE_VAD or off)")
+    sc.add_argument("--store", metavar="DIR",
+                    help="feature store: stored files skip decoding, new features are appended")
+
+    rs = sub.add_parser("rescore", help="re-classify a feature store without touching audio (with $VOXSENSE_MODEL if set)")
+    rs.add_argument("store", help="feature store directory written by `score --store`")
+    rs.add_argument("-l", "--language", default="Hindi", help="calibration (default: Hindi)")
+    rs.add_argument("--sweep", action="store_true", help="score under every language calibration at once")
+
+    tr = sub.add_parser("train", help="fit an emotion model on labelled recordings (see $VOXSENSE_MODEL)")
+    tr.add_argument("manifest", help="CSV with path and emotion columns (and optional language)")
+    tr.add_argument("-o", "--out", default="model.npz",
+                    help="model file: .npz (compact, logistic regression) or .joblib (default: model.npz)")
+    tr.add_argument("-l", "--language", default="Hindi",
+                    help="calibration for rows without their own language (default: Hindi)")
+    tr.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                    help="worker processes (default: all cores)")
+    tr.add_argument("--pitch", choices=("piptrack", "yin"),
+                    help="pitch backend (default: $VOXSENSE_PITCH or piptrack); match what serves the model")
+    tr.add_argument("--profile", choices=("hq", "balanced", "fast"),
+                    help="decode/resample profile (default: $VOXSENSE_PROFILE or hq)")
+    tr.add_argument("--vad", action="store_true", default=None,
+                    help="gate out silent frames before feature extraction (default: $VOXSENSE_VAD or off)")
+
+    tl = sub.add_parser("timeline", help="stream a long recording window by window")
+    tl.add_argument("path", help="audio file of any length (read in blocks, never fully loaded)")
+    tl.add_argument("-l", "--language", default="Hindi", help="calibration (default: Hindi)")
+    tl.add_argument("--window", type=float, default=10.0, help="window length in seconds (default: 10)")
+    tl.add_argument("--hop", type=float, default=5.0, help="seconds between window starts (default: 5)")
+
+    ch = sub.add_parser("channels", help="analyse each channel of a multichannel recording separately")
+    ch.add_argument("path", help="stereo (or multichannel) audio file, e.g. agent left / customer right")
+    ch.add_argument("-l", "--language", default="Hindi", help="calibration (default: Hindi)")
+    ch.add_argument("--labels", nargs="+", help="speaker names per channel (default: agent customer for stereo)")
+    ch.add_argument("--timeline", action="store_true",
+                    help="stream the whole file and print a side-by-side per-speaker timeline")
+    ch.add_argument("--window", type=float, default=10.0, help="timeline window in seconds (default: 10)")
+    ch.add_argument("--hop", type=float, default=5.0, help="seconds between timeline windows (default: 5)")
+    ch.add_argument("-j", "--workers", type=int, default=0,
+                    help="analyse channels in this many worker processes (default: threads)")
+
+    rt = sub.add_parser("realtime", help="replay a file as live PCM chunks and report per-chunk latency")
+    rt.add_argument("path", help="audio file fed to the incremental analyser chunk by chunk")
+    rt.add_argument("-l", "--language", default="Hindi", help="calibration (default: Hindi)")
+    rt.add_argument("--chunk", type=float, default=0.1, help="chunk length in seconds (default: 0.1)")
+    rt.add_argument("--window", type=float, default=3.0, help="seconds of history kept in the ring (default: 3)")
+
+    sv = sub.add_parser("serve", help="run the HTTP inference service")
+    sv.add_argument("--host", default="127.0.0.1")
+    sv.add_argument("--port", type=int, default=8000)
+    sv.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                    help="decode/feature worker processes (default: all cores)")
+    sv.add_argument("--max-pending", type=int, default=64,
+                    help="requests admitted at once before answering 429 (default: 64)")
+    sv.add_argument("--max-batch", type=int, default=64, help="rows per classification batch")
+    sv.add_argument("--max-wait-ms", type=float, default=5.0,
+                    help="how long the batcher collects requests (default: 5 ms)")
+
+    sv.add_argument("--no-warmup", dest="warm", action="store_false",
+                    help="skip warming the workers before accepting requests")
+
+    wu = sub.add_parser("warmup", help="pay import / JIT costs once and report cold vs warm latency")
+    wu.add_argument("--seconds", type=float, default=1.0, help="synthetic clip length (default: 1)")
+
+    lt = sub.add_parser("loadtest", help="hammer a running service and report p50/p99 latency and RPS")
+    lt.add_argument("url", help="e.g. http://127.0.0.1:8000/v1/analyse?language=Hindi")
+    lt.add_argument("--file", help="request body, e.g. an audio clip for /v1/analyse")
+    lt.add_argument("--method", default="POST")
+    lt.add_argument("-n", "--requests", type=int, default=200)
+    lt.add_argument("-c", "--concurrency", type=int, default=16)
+
+    args = parser.parse_args(argv)
+    if args.command == "score":
+        from .batch import run_batch
+        from .store import StoreMismatch
+        if args.resume and args.out == "-":
+            parser.error("--resume needs --out pointing at a file")
+        try:
+            summary = run_batch(args.source, args.out, args.language, args.workers,
+                                args.chunksize, args.resume, pitch=args.pitch, profile=args.profile,
+                                store=args.store, vad=args.vad)
+        except StoreMismatch as e:
+            parser.error(f"--store: {e}")
+        return 1 if summary["errors"] and not summary["ok"] else 0
+    if args.command == "rescore":
+        import json
+        import time
+        import numpy as np
+        from .classify import EMOTION_NAMES, LANGUAGES, classify_batch, resolve_language, sweep_languages, top_emotions
+        from .model import RuleClassifier, get_classifier
+        from .store import FeatureStore
+        store = FeatureStore(args.store, readonly=True)
+        clf   = get_classifier()
+        t0    = time.perf_counter()
+        langs = list(LANGUAGES) if args.sweep else [resolve_language(args.language)]
+        if isinstance(clf, RuleClassifier):
+            P = sweep_languages(store.matrix(), langs) if args.sweep else classify_batch(store.matrix(), langs[0])[None]
+        else:
+            # $VOXSENSE_MODEL: the store keeps mfcc_mean too, so the model scores straight off the memory maps
+            columns = {k: store.mfcc if k == "mfcc_mean" else store.column(k) for k in clf.features}
+            P = np.stack([clf.classify_columns(columns, len(store), lang) for lang in langs])
+        for lang, labels in zip(langs, top_emotions(P)):
+            counts = {e: int(np.sum(labels == e)) for e in EMOTION_NAMES}
+            print(json.dumps({"language": lang.split(" (")[0], "files": len(store), "counts": counts},
+                             ensure_ascii=False))
+        print(f"{len(store)} files × {len(langs)} calibrations with {clf.name} in {time.perf_counter() - t0:.3f}s",
+              file=sys.stderr)
+        return 0
+    if args.command == "train":
+        import json
+        from .batch import train_model
+        summary = train_model(args.manifest, args.out, args.language, args.workers,
+                              pitch=args.pitch, profile=args.profile, vad=args.vad)
+        print(json.dumps(summary, ensure_ascii=False))
+        return 0
+    if args.command == "timeline":
+        import json
+        from .batch import SCALARS
+        from .classify import resolve_language
+        from .stream import analyse_stream
+        for row in analyse_stream(args.path, resolve_language(args.language), args.window, args.hop, want=SCALARS):
+            f = row.pop("features")
+            row.update({k: round(f[k], 6) for k in SCALARS})
+            print(json.dumps(row, ensure_ascii=False), flush=True)
+        return 0
+    if args.command == "channels":
+        import json
+        from concurrent.futures import ProcessPoolExecutor
+        from .batch import SCALARS
+        from .channels import analyse_channels, channel_timeline
+        from .classify import resolve_language
+        from .warmup import warmup
+        lang = resolve_language(args.language)
+        pool = ProcessPoolExecutor(args.workers, initializer=warmup) if args.workers else None
+        try:
+            if args.timeline:
+                for row in channel_timeline(args.path, lang, args.window, args.hop, args.labels, pool, ()):
+                    row["channels"] = [{k: c[k] for k in ("label", "emotion", "confidence")} for c in row["channels"]]
+                    print(json.dumps(row, ensure_ascii=False), flush=True)
+                return 0
+            with open(args.path, "rb") as fh:
+                results, error = analyse_channels(fh.read(), lang, args.labels, executor=pool, want=SCALARS)
+            if error:
+                print(error, file=sys.stderr)
+                return 1
+            for r in results:
+                f = r.pop("features")
+                r.pop("probs")
+                r.update({k: round(f[k], 6) for k in SCALARS})
+                print(json.dumps(r, ensure_ascii=False))
+            return 0
+        finally:
+            if pool: pool.shutdown()
+    if args.command == "realtime":
+        import json
+        import soundfile as sf
+        from .classify import resolve_language
+        from .realtime import IncrementalAnalyser
+        sr = sf.info(args.path).samplerate
+        an = IncrementalAnalyser(input_sr=sr, lang_key=resolve_language(args.language), window=args.window)
+        an.warmup()
+        for i, block in enumerate(sf.blocks(args.path, blocksize=int(args.chunk * sr), dtype="int16", always_2d=True)):
+            result = an.push(block.mean(axis=1).astype("int16") if block.shape[1] > 1 else block[:, 0])
+            if result:
+                print(json.dumps({"t": round((i + 1) * args.chunk, 2), "emotion": result["emotion"],
+                                  "confidence": result["confidence"], "latency_ms": result["latency_ms"]}), flush=True)
+        print(json.dumps(an.latency_stats()), file=sys.stderr)
+        return 0
+    if args.command == "serve":
+        from .server import serve
+        serve(args.host, args.port, workers=args.workers, max_pending=args.max_pending,
+              max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, warm=args.warm)
+        return 0
+    if args.command == "warmup":
+        import json
+        from .metrics import get_metrics
+        from .warmup import warmup
+        cold, warm = warmup(args.seconds), warmup(args.seconds)
+        print(json.dumps({"import_s": round(get_metrics().startup["import"], 3),
+                          "cold_s": {k: round(v, 3) for k, v in cold.items()},
+                          "warm_s": {k: round(v, 3) for k, v in warm.items()},
+                          "numba_cache_dir": os.environ.get("NUMBA_CACHE_DIR") or "(numba default)"}, indent=2))
+        return 0
+    if args.command == "loadtest":
+        import json
+        from .loadtest import load_test
+        report = load_test(args.url, args.file, args.method, args.requests, args.concurrency)
+        print(json.dumps(report, indent=2))
+        return 0 if report["ok"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
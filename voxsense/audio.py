@@ -0,0 +1,46 @@
+import io
+import os
+import numpy as np
+import librosa
+from collections import namedtuple
+
+# How decoded audio is brought to the analysis rate.
+#   target_sr  rate used when the source has to be resampled
+#   res_type   librosa/soxr resampler quality for that case
+#   native     (lo, hi) source rates analysed as-is, skipping the resampler entirely
+# "hq" is the original behaviour (everything → 22.05 kHz, soxr_hq) and what the
+# classifier thresholds were tuned on; "fast" keeps telephony and wideband rates
+# (8–24 kHz) native and brings higher rates down with the cheap resampler — analysing
+# 44.1/48 kHz natively would cost more in STFT work than the resample saves.
+Profile = namedtuple("Profile", "name target_sr res_type native")
+
+SR = 22050
+
+PROFILES = {
+    "hq":       Profile("hq",       SR, "soxr_hq", None),
+    "balanced": Profile("balanced", SR, "soxr_mq", (16000, 24000)),
+    "fast":     Profile("fast",     SR, "soxr_lq", (8000, 24000)),
+}
+
+DEFAULT_PROFILE = os.environ.get("VOXSENSE_PROFILE", "hq")
+
+def get_profile(profile=None):
+    if isinstance(profile, Profile): return profile
+    name = profile or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise KeyError(f"Unknown audio profile {name!r} — choose from: {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+def conform(y, native_sr, profile=None):
+    # Returns (y, sr) per the profile; y is returned untouched when the native rate is accepted
+    p = get_profile(profile)
+    if p.native and p.native[0] <= native_sr <= p.native[1]: return y, native_sr
+    if native_sr == p.target_sr: return y, native_sr
+    return librosa.resample(y, orig_sr=native_sr, target_sr=p.target_sr, res_type=p.res_type), p.target_sr
+
+def decode(audio_bytes, duration=None, profile=None, mono=True):
+    # One decode straight to float32, then conform() — the only resample in the pipeline.
+    # mono=False keeps the channels as a C-contiguous (channels, samples) array, mono files included
+    y, native_sr = librosa.load(io.BytesIO(audio_bytes), sr=None, duration=duration, mono=mono)
+    if not mono: y = np.ascontiguousarray(np.atleast_2d(y))
+    return conform(y, native_sr, profile)
@@ -0,0 +1,219 @@
+import os
+import csv
+import sys
+import json
+import time
+import multiprocessing as mp
+from functools import partial
+
+from .audio import get_profile
+from .classify import EMOTIONS, EMOTION_NAMES, FEATURE_COLUMNS, resolve_language
+from .features import DEFAULT_PITCH, DEFAULT_VAD, SCALARS, extract_features
+from .model import fit_model, get_classifier, with_inputs
+from .store import FeatureStore
+
+AUDIO_EXTS = (".wav", ".mp3", ".ogg", ".flac")
+FIELDS     = ("path", "language", "emotion", "confidence",
+              *[f"p_{e.lower()}" for e in EMOTIONS], *SCALARS, "elapsed_ms", "error")
+
+def iter_inputs(source, language):
+    # Yields (path, language) pairs lazily so huge manifests never sit in memory.
+    # A manifest is either a CSV with a `path` column (and optional `language`)
+    # or plain text with one path per line; relative paths resolve against it.
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(AUDIO_EXTS): yield os.path.join(root, name), language
+        return
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, newline="", encoding="utf-8") as fh:
+        if source.lower().endswith(".csv"):
+            for row in csv.DictReader(fh):
+                yield os.path.join(base, row["path"]), row.get("language") or language
+        else:
+            for line in fh:
+                line = line.strip()
+                if line and not line.startswith("#"): yield os.path.join(base, line), language
+
+_stores = {}
+
+def _store(path):
+    # One read-only view per worker process; the parent is the only writer
+    if path not in _stores: _stores[path] = FeatureStore(path, readonly=True)
+    _stores[path].refresh()
+    return _stores[path]
+
+def score_file(task, pitch=None, profile=None, store=None, vad=None):
+    # Runs in a worker process; never raises — failures land in the row's `error` column.
+    # With a feature-store path, stored files skip decoding and fresh features ride
+    # back to the parent in row["_store"] to be appended.
+    path, language = task
+    row = {"path": path, "language": language}
+    t0  = time.perf_counter()
+    try:
+        lang_key = resolve_language(language)
+        row["language"] = lang_key.split(" (")[0]
+        with open(path, "rb") as fh: audio_bytes = fh.read()
+        features = _store(store).get(audio_bytes) if store else None
+        error    = None
+        if features is None:
+            # The CSV/JSONL row needs SCALARS; a store row also needs mfcc_mean, so it takes everything
+            features, error = extract_features(audio_bytes, use_cache=False, pitch=pitch, profile=profile, vad=vad,
+                                               want=None if store else with_inputs(SCALARS))
+            if store and not error: row["_store"] = (FeatureStore.key(audio_bytes), features)
+        if error:
+            row["error"] = error
+        else:
+            emotion, probs = get_classifier().classify(features, lang_key)
+            row["emotion"]    = emotion
+            row["confidence"] = round(probs[emotion]*100, 1)
+            row.update({f"p_{e.lower()}": p for e, p in probs.items()})
+            row.update({k: round(features[k], 6) for k in SCALARS})
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["elapsed_ms"] = round((time.perf_counter() - t0)*1000, 1)
+    return row
+
+class CsvSink:
+    def __init__(self, fh, fresh):
+        self.fh = fh
+        self.w  = csv.DictWriter(fh, fieldnames=FIELDS, extrasaction="ignore")
+        if fresh: self.w.writeheader()
+    def write(self, row):
+        self.w.writerow(row); self.fh.flush()
+
+class JsonlSink:
+    def __init__(self, fh, fresh):
+        self.fh = fh
+    def write(self, row):
+        self.fh.write(json.dumps(row, ensure_ascii=False) + "\n"); self.fh.flush()
+
+def _sink_for(out, fh, fresh):
+    return (CsvSink if out.lower().endswith(".csv") else JsonlSink)(fh, fresh)
+
+def completed_paths(out):
+    # The output file doubles as the checkpoint: every path already scored is done.
+    # Rows with an error don't count, so a resumed run retries them (a transient I/O
+    # error, a killed worker) and appends the new row after the old one.
+    # A torn last line from a crash is cut off so appended rows start cleanly.
+    if out == "-" or not os.path.exists(out): return set()
+    with open(out, "rb+") as fh:
+        data = fh.read()
+        if data and not data.endswith(b"\n"):
+            fh.truncate(data.rfind(b"\n") + 1)
+    done = set()
+    with open(out, newline="", encoding="utf-8") as fh:
+        if out.lower().endswith(".csv"):
+            done.update(row["path"] for row in csv.DictReader(fh) if row.get("path") and not row.get("error"))
+        else:
+            for line in fh:
+                try: row = json.loads(line)
+                except ValueError: continue
+                if isinstance(row, dict) and row.get("path") and not row.get("error"): done.add(row["path"])
+    return done
+
+def run_batch(source, out="-", language="Hindi", workers=None, chunksize=4, resume=False, log=sys.stderr,
+              pitch=None, profile=None, store=None, vad=None):
+    workers = workers or os.cpu_count() or 1
+    fstore  = None
+    if store:
+        fstore = FeatureStore(store, pitch, profile, vad)
+        fstore.check(pitch or DEFAULT_PITCH, get_profile(profile).name, DEFAULT_VAD if vad is None else vad)
+    done    = completed_paths(out) if resume else set()
+    tasks   = ((p, lang) for p, lang in iter_inputs(source, language) if p not in done)
+    fresh   = out == "-" or not (resume and os.path.exists(out) and os.path.getsize(out))
+    fh      = sys.stdout if out == "-" else open(out, "a" if resume else "w", newline="", encoding="utf-8")
+    sink    = _sink_for(out, fh, fresh)
+    n = errors = 0
+    pool = None
+    t0 = time.perf_counter()
+
+    def report(final=False):
+        rate = n / max(time.perf_counter() - t0, 1e-9)
+        print(f"{'done' if final else 'scored'} {n} files · {errors} errors · {rate:.1f} files/s"
+              + (f" · {len(done)} skipped (resume)" if final and done else ""), file=log, flush=True)
+
+    try:
+        if workers == 1:
+            rows = map(partial(score_file, pitch=pitch, profile=profile, store=store, vad=vad), tasks)
+        else:
+            pool = mp.Pool(workers)
+            rows = pool.imap_unordered(partial(score_file, pitch=pitch, profile=profile, store=store, vad=vad), tasks, chunksize=chunksize)
+        for row in rows:
+            entry = row.pop("_store", None)
+            if entry: fstore.add(None, entry[1], key=entry[0])
+            sink.write(row)
+            n += 1
+            errors += bool(row.get("error"))
+            if n % 100 == 0: report()
+        if pool: pool.close(); pool.join()
+    finally:
+        if pool is not None: pool.terminate()
+        if fh is not sys.stdout: fh.close()
+    report(final=True)
+    return {"ok": n - errors, "errors": errors, "skipped": len(done),
+            "seconds": round(time.perf_counter() - t0, 3)}
+
+def read_labels(manifest, language):
+    # A training manifest is a CSV with path and emotion columns (and optional
+    # language); emotions match EMOTION_NAMES case-insensitively. Every label and
+    # language is checked before any audio is decoded.
+    names = {e.lower(): e for e in EMOTION_NAMES}
+    base  = os.path.dirname(os.path.abspath(manifest))
+    tasks = []
+    with open(manifest, newline="", encoding="utf-8") as fh:
+        for i, row in enumerate(csv.DictReader(fh), 2):
+            emotion = names.get((row.get("emotion") or "").strip().lower())
+            if emotion is None:
+                raise ValueError(f"{manifest}:{i}: emotion {row.get('emotion')!r} is not one of {', '.join(EMOTION_NAMES)}")
+            try: lang_key = resolve_language(row.get("language") or language)
+            except KeyError as e: raise ValueError(f"{manifest}:{i}: {e.args[0]}") from None
+            tasks.append((os.path.join(base, row["path"]), lang_key, emotion))
+    return tasks
+
+def _train_features(task, pitch=None, profile=None, vad=None):
+    # Runs in a worker process, like score_file: (task, features, error)
+    try:
+        with open(task[0], "rb") as fh: audio_bytes = fh.read()
+        features, error = extract_features(audio_bytes, use_cache=False, pitch=pitch, profile=profile, vad=vad,
+                                           want=("mfcc_mean",) + FEATURE_COLUMNS)
+    except Exception as e:
+        features, error = None, f"{type(e).__name__}: {e}"
+    return task, features, error
+
+def train_model(manifest, out, language="Hindi", workers=None, chunksize=4, log=sys.stderr,
+                pitch=None, profile=None, vad=None):
+    # Extracts the model's inputs for every labelled file, fits the default pipeline
+    # and saves it to `out` (.npz, or .joblib). Files that fail to decode are skipped.
+    # Extract with the pitch / profile / vad the model will be served with.
+    tasks   = read_labels(manifest, language)
+    workers = workers or os.cpu_count() or 1
+    work    = partial(_train_features, pitch=pitch, profile=profile, vad=vad)
+    rows, labels, langs, errors = [], [], [], 0
+    pool = None
+    t0 = time.perf_counter()
+    try:
+        if workers == 1:
+            results = map(work, tasks)
+        else:
+            pool = mp.Pool(workers)
+            results = pool.imap_unordered(work, tasks, chunksize=chunksize)
+        for (path, lang, emotion), features, error in results:
+            if error:
+                errors += 1
+                print(f"skipped {path}: {error}", file=log, flush=True)
+                continue
+            rows.append(features); labels.append(emotion); langs.append(lang)
+        if pool: pool.close(); pool.join()
+    finally:
+        if pool is not None: pool.terminate()
+    if not rows: raise ValueError(f"{manifest}: no usable recordings")
+    model = fit_model(rows, labels, langs)
+    model.save(out)
+    accuracy = float((model.classify_batch(rows, langs).argmax(axis=1) ==
+                      [EMOTION_NAMES.index(e) for e in labels]).mean())
+    counts = {e: labels.count(e) for e in EMOTION_NAMES if e in labels}
+    print(f"trained {model.name} on {len(rows)} files · {errors} errors · training accuracy {accuracy:.1%}"
+          f" · {time.perf_counter() - t0:.1f}s → {out}", file=log, flush=True)
+    return {"files": len(rows), "errors": errors, "counts": counts, "train_accuracy": round(accuracy, 4)}
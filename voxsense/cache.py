@@ -0,0 +1,108 @@
+import os
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+
+class AudioCache:
+    # Content-addressed LRU cache for decoded samples and feature dicts.
+    # Values are dicts of arrays/scalars; memory is bounded by their total nbytes.
+    # With disk_dir set, every entry is also written there as <key>.npz and
+    # reloaded on a memory miss, so the cache survives process restarts.
+    def __init__(self, max_bytes=256 << 20, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir  = disk_dir
+        self._mem   = OrderedDict()
+        self._bytes = 0
+        self._lock  = threading.Lock()
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+        if disk_dir: os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def key(audio_bytes, kind, **params):
+        h = hashlib.sha256(audio_bytes)
+        h.update(repr((kind, sorted(params.items()))).encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def _nbytes(value):
+        return sum(np.asarray(v).nbytes for v in value.values())
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + ".npz")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return dict(self._mem[key])
+        value = self._disk_get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._insert(key, value)
+        return dict(value)
+
+    def put(self, key, value):
+        with self._lock:
+            self._insert(key, value)
+        if self.disk_dir: self._disk_put(key, value)
+
+    def _insert(self, key, value):
+        # Every cached array is shared by whoever gets it, whether it came from put() or disk
+        for v in value.values():
+            if isinstance(v, np.ndarray): v.flags.writeable = False
+        if key in self._mem:
+            self._bytes -= self._nbytes(self._mem.pop(key))
+        self._mem[key] = value
+        self._bytes += self._nbytes(value)
+        while self._bytes > self.max_bytes and len(self._mem) > 1:
+            _, old = self._mem.popitem(last=False)
+            self._bytes -= self._nbytes(old)
+            self.evictions += 1
+
+    def _disk_get(self, key):
+        if not self.disk_dir or not os.path.exists(self._path(key)): return None
+        try:
+            with np.load(self._path(key), allow_pickle=False) as z:
+                return {k: (z[k].item() if z[k].ndim == 0 else z[k]) for k in z.files}
+        except Exception:
+            try: os.remove(self._path(key))
+            except OSError: pass
+            return None
+
+    def _disk_put(self, key, value):
+        tmp = self._path(key) + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as fh: np.savez(fh, **value)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try: os.remove(tmp)
+            except OSError: pass
+
+    def clear(self):
+        # Drops the in-memory tier only; the disk tier is left for other processes
+        with self._lock:
+            self._mem.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "entries": len(self._mem),
+                    "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+_cache, _cache_lock = None, threading.Lock()
+
+def get_cache():
+    # Process-wide instance: imported modules outlive Streamlit script reruns,
+    # so every session in the server process shares this one.
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AudioCache(max_bytes=int(os.environ.get("VOXSENSE_CACHE_MB", 256)) << 20,
+                                disk_dir=os.environ.get("VOXSENSE_CACHE_DIR") or None)
+        return _cache
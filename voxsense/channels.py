@@ -0,0 +1,83 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .audio import decode, get_profile
+from .cache import get_cache
+from .classify import DEFAULT_LANGUAGE
+from .features import MAX_DURATION, SR, TOO_SHORT, features_from_signal
+from .model import get_classifier, with_inputs
+from .stream import iter_windows
+
+# Per-channel analysis for multichannel recordings (call centre stereo: agent on
+# one side, customer on the other). load_audio downmixes, which blends the two
+# voices into one feature set. Here each upload is decoded once into a
+# (channels, samples) array, and features_from_signal runs on every channel
+# concurrently. The heavy stages (STFT, mel/MFCC matmuls, piptrack's array
+# maths) run in numpy/BLAS/pocketfft with the GIL released, so a thread per
+# channel keeps wall time close to the mono case on a multi-core box. Any
+# concurrent.futures executor can be passed instead, e.g. a warmed-up process pool.
+CHANNEL_LABELS = ("agent", "customer")
+
+_pool, _pool_lock = None, threading.Lock()
+
+def _executor():
+    # One pool per process, however many jobs and sessions ask for it at once
+    global _pool
+    with _pool_lock:
+        if _pool is None: _pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="voxsense-channel")
+        return _pool
+
+def labels_for(n, labels=None):
+    # Names for n channels: the given labels (or agent/customer for stereo), then "ch<i>"
+    labels = list(labels or (CHANNEL_LABELS if n == 2 else ()))
+    return labels[:n] + [f"ch{i}" for i in range(len(labels), n)]
+
+def load_channels(audio_bytes, duration=MAX_DURATION, use_cache=True, profile=None):
+    # load_audio without the downmix: (channels, samples) float32 and sr, cached per upload
+    profile = get_profile(profile)
+    if not use_cache: return decode(audio_bytes, duration, profile, mono=False)
+    cache = get_cache()
+    key   = cache.key(audio_bytes, "decode", duration=duration, profile=profile.name, mono=False)
+    hit   = cache.get(key)
+    if hit is not None: return hit["y"], hit["sr"]
+    Y, sr = decode(audio_bytes, duration, profile, mono=False)
+    cache.put(key, {"y": Y, "sr": sr})
+    return Y, sr
+
+def _analyse(y, sr, lang_key, pitch, vad, want=None, stage=None):
+    classifier = get_classifier()
+    features = features_from_signal(y, sr, pitch, stage, vad, with_inputs(want, classifier))
+    emotion, probs = classifier.classify(features, lang_key)
+    return {"emotion": emotion, "confidence": round(probs[emotion]*100, 1), "probs": probs, "features": features}
+
+def analyse_signals(Y, sr, lang_key=DEFAULT_LANGUAGE, labels=None, pitch=None, vad=None, executor=None, want=None,
+                    stage=None):
+    # One result per row of Y, analysed concurrently; each carries its channel index and label.
+    # stage, if given, is entered by every channel's worker (so it must be thread-safe).
+    ex = executor or _executor()
+    futures = [ex.submit(_analyse, y, sr, lang_key, pitch, vad, want, stage) for y in Y]
+    return [{"channel": i, "label": label, **f.result()}
+            for i, (label, f) in enumerate(zip(labels_for(len(Y), labels), futures))]
+
+def analyse_channels(audio_bytes, lang_key=DEFAULT_LANGUAGE, labels=None, pitch=None, profile=None,
+                     vad=None, executor=None, use_cache=True, want=None):
+    # Returns (results, error) like extract_features; results has one entry per channel
+    try:
+        Y, sr = load_channels(audio_bytes, use_cache=use_cache, profile=profile)
+        if Y.shape[1] < sr * 0.5:
+            return None, TOO_SHORT
+        return analyse_signals(Y, sr, lang_key, labels, pitch, vad, executor, want), None
+    except Exception as e:
+        return None, f"Processing error: {str(e)}"
+
+def channel_timeline(source, lang_key=DEFAULT_LANGUAGE, window=10.0, hop=5.0, labels=None, executor=None,
+                     want=None, tap=None):
+    # analyse_stream for every channel side by side. Yields one row per window:
+    # {"start", "end", "channels": [{"label", "emotion", "confidence", ...} per channel]}.
+    # tap(start, Y) sees every (channels, samples) window first, as in analyse_stream.
+    for start, Y in iter_windows(source, window, hop, mono=False):
+        if tap: tap(start, Y)
+        if Y.shape[1] < SR * 0.5: continue
+        yield {"start": round(start, 3), "end": round(start + Y.shape[1]/SR, 3),
+               "channels": analyse_signals(Y, SR, lang_key, labels, executor=executor, want=want)}
@@ -0,0 +1,165 @@
+import operator
+import numpy as np
+
+EMOTIONS = {
+    "Calm":     {"emoji":"😌","scripts":"শান্ত · शांत · ਸ਼ਾਂਤ · ശാന്തം","color":"#10b981","css":"result-calm","description":"Relaxed, composed, low arousal"},
+    "Stressed": {"emoji":"😰","scripts":"চাপে · तनाव · ਤਣਾਅ · സമ്മർദ്ദം","color":"#f59e0b","css":"result-stressed","description":"Tense, anxious, high-pressure"},
+    "Angry":    {"emoji":"😠","scripts":"রাগ · गुस्सा · ਗੁੱਸਾ · കോപം","color":"#ef4444","css":"result-angry","description":"Elevated energy, sharp vocal edges"},
+    "Fearful":  {"emoji":"😨","scripts":"ভয় · डर · ਡਰ · ഭയം","color":"#8b5cf6","css":"result-fearful","description":"High pitch variability, erratic energy"},
+    "Happy":    {"emoji":"😊","scripts":"আনন্দ · खुशी · ਖੁਸ਼ੀ · സന്തോഷം","color":"#f97316","css":"result-happy","description":"Bright, energetic, elevated pitch"},
+    "Sad":      {"emoji":"😔","scripts":"দুঃখ · दुख · ਦੁੱਖ · സങ്കടം","color":"#3b82f6","css":"result-sad","description":"Low energy, slow tempo, falling pitch"},
+}
+
+LANGUAGES = {
+    "Bengali (বাংলা)":   {"offset":18,"scale":0.88,"note":"Vowel-rich, tonal — Eastern India & Bangladesh"},
+    "Hindi (हिंदी)":     {"offset":0, "scale":1.00,"note":"Baseline calibration — Indo-Aryan family"},
+    "Punjabi (ਪੰਜਾਬੀ)": {"offset":12,"scale":1.18,"note":"High-energy prosody, tonal language"},
+    "Tamil (தமிழ்)":     {"offset":8, "scale":0.95,"note":"Dravidian — distinct from Indo-Aryan family"},
+    "Telugu (తెలుగు)":   {"offset":6, "scale":0.97,"note":"Syllable-timed, melodic Dravidian rhythm"},
+    "Marathi (मराठी)":   {"offset":4, "scale":1.02,"note":"Close to Hindi but distinct prosodic stress"},
+    "Malayalam (മലയ.)":  {"offset":10,"scale":0.93,"note":"Complex morphology, Dravidian family"},
+    "Hinglish":           {"offset":5, "scale":1.05,"note":"Code-switching — language-agnostic processing"},
+    "Indian English":     {"offset":2, "scale":1.00,"note":"Distinct rhythm vs British/American English"},
+}
+
+DEFAULT_LANGUAGE = "Hindi (हिंदी)"
+
+def resolve_language(name):
+    # Accepts a full LANGUAGES key or just its English name, case-insensitive ("bengali")
+    if name in LANGUAGES: return name
+    for key in LANGUAGES:
+        if key.split(" (")[0].lower() == name.strip().lower(): return key
+    raise KeyError(f"Unknown language {name!r} — choose from: "
+                   + ", ".join(k.split(" (")[0] for k in LANGUAGES))
+
+# The rule set as data. Each rule is an if/elif chain over one feature:
+# (feature, ((op, threshold, {emotion: weight}), ...)). The first branch whose
+# comparison holds adds its weights; op None is the trailing else.
+# pitch_mean and rms_mean are language-calibrated before the rules run.
+RULES = (
+    ("rms_mean", (("<",  0.012, {"Calm":0.35, "Sad":0.20}),
+                  ("<",  0.035, {"Calm":0.25, "Sad":0.10, "Stressed":0.10}),
+                  ("<",  0.070, {"Stressed":0.28, "Happy":0.15}),
+                  ("<",  0.120, {"Angry":0.30, "Stressed":0.18, "Happy":0.10}),
+                  (None, None,  {"Angry":0.42, "Stressed":0.12}))),
+    ("pitch_mean", (("<=", 0,   {}),
+                    ("<",  140, {"Sad":0.25, "Calm":0.15}),
+                    ("<",  210, {"Calm":0.20, "Happy":0.10}),
+                    ("<",  300, {"Stressed":0.22, "Happy":0.12}),
+                    ("<",  400, {"Fearful":0.25, "Stressed":0.12}),
+                    (None, None,{"Fearful":0.32, "Angry":0.08}))),
+    ("pitch_range", ((">",  250, {"Fearful":0.18, "Stressed":0.10}),
+                     (">",  120, {"Stressed":0.12, "Happy":0.08}),
+                     ("<",  40,  {"Calm":0.12, "Sad":0.08}),
+                     (None, None,{}))),
+    ("zcr", (("<",  0.030, {"Calm":0.18, "Sad":0.10}),
+             ("<",  0.060, {"Stressed":0.10, "Happy":0.08}),
+             ("<",  0.095, {"Angry":0.18, "Stressed":0.08}),
+             (None, None,  {"Angry":0.22, "Fearful":0.08}))),
+    ("rms_std", ((">",  0.045, {"Angry":0.10, "Stressed":0.12}),
+                 (">",  0.022, {"Stressed":0.08, "Happy":0.05}),
+                 (None, None,  {"Calm":0.10, "Sad":0.05}))),
+    ("spec_cent", (("<",  1000, {"Sad":0.12, "Calm":0.08}),
+                   ("<",  2200, {"Calm":0.08}),
+                   ("<",  3800, {"Stressed":0.10, "Happy":0.08}),
+                   (None, None, {"Angry":0.14, "Fearful":0.06}))),
+    ("contrast", ((">",  28,   {"Angry":0.08, "Happy":0.06}),
+                  ("<",  10,   {"Calm":0.07, "Sad":0.06}),
+                  (None, None, {}))),
+    ("tempo", ((">",  145,  {"Happy":0.10, "Stressed":0.08}),
+               ("<",  70,   {"Sad":0.12, "Calm":0.08}),
+               (None, None, {}))),
+)
+
+_OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt}
+
+EMOTION_NAMES   = tuple(EMOTIONS)
+FEATURE_COLUMNS = tuple(feature for feature, _ in RULES)
+
+def _calibrated(features, offset, scale):
+    # max(0, pitch - offset) written so NaN maps to 0 exactly like the builtin max
+    pitch = features["pitch_mean"] - offset
+    return {**features,
+            "pitch_mean": np.where(pitch > 0, pitch, 0) if isinstance(pitch, np.ndarray) else max(0, pitch),
+            "rms_mean":   features["rms_mean"] * scale}
+
+def classify_emotion(features, lang_key="Hindi (हिंदी)"):
+    cfg = LANGUAGES.get(lang_key, LANGUAGES["Hindi (हिंदी)"])
+    x   = _calibrated(features, cfg["offset"], cfg["scale"])
+    s   = {e: 0.0 for e in EMOTIONS}
+    for feature, branches in RULES:
+        for op, threshold, weights in branches:
+            if op is None or _OPS[op](x[feature], threshold):
+                for e, w in weights.items(): s[e] += w
+                break
+
+    total = sum(s.values())
+    if total == 0: return "Calm", {e:1/6 for e in EMOTIONS}
+    probs = {e: round(v/total, 3) for e,v in s.items()}
+    return max(probs, key=probs.get), probs
+
+# ── Vectorised path ──────────────────────────────────────────────────────────
+# Same RULES, evaluated with NumPy over an N×F matrix whose columns follow
+# FEATURE_COLUMNS. Scores accumulate rule by rule and emotion by emotion in the
+# scalar order, so the floating-point sums — and the probabilities — are identical.
+
+_TABLES = tuple(
+    (FEATURE_COLUMNS.index(feature),
+     tuple((op, threshold) for op, threshold, _ in branches),
+     np.array([[w.get(e, 0.0) for e in EMOTION_NAMES] for _, _, w in branches]))
+    for feature, branches in RULES)
+
+def feature_matrix(rows):
+    # Feature dicts (as returned by extract_features) → float64 matrix of FEATURE_COLUMNS
+    return np.array([[r[c] for c in FEATURE_COLUMNS] for r in rows], dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS))
+
+def calibration(lang_keys):
+    # A language (full key or short name, see resolve_language) or a sequence of them
+    # → (offset, scale) arrays; unknown names raise instead of silently becoming Hindi
+    keys = [lang_keys] if isinstance(lang_keys, str) else list(lang_keys)
+    lut  = {k: LANGUAGES[resolve_language(k)] for k in set(keys)}
+    cfgs = [lut[k] for k in keys]
+    return (np.array([c["offset"] for c in cfgs], dtype=np.float64),
+            np.array([c["scale"]  for c in cfgs], dtype=np.float64))
+
+def _round3(p):
+    # np.round scales by 1000 before rounding, so it can disagree with the builtin
+    # round() right at a ...5 boundary; those few values are re-rounded in Python.
+    r    = np.round(p, 3)
+    near = np.abs((p*1000) % 1 - 0.5) < 1e-6
+    if near.any(): r[near] = [round(v, 3) for v in p[near].tolist()]
+    return r
+
+def score_matrix(X, offset=0.0, scale=1.0):
+    # X is N×F; offset/scale broadcast against the row axis, so (N,) arrays give
+    # per-row calibration and (L, 1) arrays give an L×N sweep. Returns (..., 6) probabilities.
+    X = np.asarray(X, dtype=np.float64)
+    cols = {c: X[:, i] for i, c in enumerate(FEATURE_COLUMNS)}
+    x = _calibrated(cols, np.asarray(offset, dtype=np.float64), np.asarray(scale, dtype=np.float64))
+    shape = np.broadcast_shapes(*(np.shape(v) for v in x.values()))
+    s = np.zeros(shape + (len(EMOTION_NAMES),))
+    for i, branches, W in _TABLES:
+        v = x[FEATURE_COLUMNS[i]]
+        conds = [_OPS[op](v, threshold) for op, threshold in branches if op is not None]
+        s += W[np.select(conds, range(len(conds)), default=len(branches) - 1)]
+    total = s[..., 0].copy()
+    for j in range(1, s.shape[-1]): total += s[..., j]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        probs = _round3(s / total[..., None])
+    probs[total == 0] = 1/6
+    return probs
+
+def classify_batch(X, lang_keys="Hindi (हिंदी)"):
+    # N×F features → N×6 probabilities (columns follow EMOTION_NAMES);
+    # lang_keys is one LANGUAGES key for all rows or one per row
+    offset, scale = calibration(lang_keys)
+    return score_matrix(X, offset, scale)
+
+def sweep_languages(X, lang_keys=None):
+    # Re-score every row under every calibration at once → L×N×6
+    offset, scale = calibration(list(LANGUAGES) if lang_keys is None else lang_keys)
+    return score_matrix(X, offset[:, None], scale[:, None])
+
+def top_emotions(probs):
+    # Argmax over the last axis, first maximum wins like max(probs, key=probs.get)
+    return np.array(EMOTION_NAMES)[np.argmax(probs, axis=-1)]
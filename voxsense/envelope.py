@@ -0,0 +1,127 @@
+import numpy as np
+import soundfile as sf
+
+from .cache import get_cache
+from .features import load_audio
+
+# Waveform display data. Plain striding (y[::step]) aliases: a click or shout
+# falling between two kept samples disappears. A min/max envelope keeps every
+# peak. The pyramid stores the envelope at base, base·factor, base·factor², …
+# samples per bin, so any time range is drawn from the coarsest level that
+# still has `points` bins. A view touches at most points·factor values,
+# whatever the recording length, and never rescans samples.
+
+def minmax(lo, hi, points):
+    # Reduces paired lo/hi arrays to at most `points` bins; returns (bin starts, lo, hi)
+    if len(lo) <= points: return np.arange(len(lo)), lo, hi
+    starts = np.unique(np.linspace(0, len(lo), points, endpoint=False).astype(np.int64))
+    return starts, np.minimum.reduceat(lo, starts), np.maximum.reduceat(hi, starts)
+
+def _bins(y, size):
+    # (lo, hi) of every `size`-sample bin; a short tail becomes one last bin
+    n = len(y) // size * size
+    lo, hi = y[:n].reshape(-1, size).min(axis=1), y[:n].reshape(-1, size).max(axis=1)
+    if n < len(y): lo, hi = np.append(lo, y[n:].min()), np.append(hi, y[n:].max())
+    return lo.astype(np.float32), hi.astype(np.float32)
+
+class EnvelopeBuilder:
+    # Bins consecutive blocks of samples of any size as they arrive, so a pass that
+    # already reads the audio (a file stream, the timeline windows) yields the envelope
+    # too; only the unbinned remainder of the last block is held between pushes.
+    def __init__(self, sr, base=256, factor=4):
+        self.sr, self.base, self.factor, self.n = sr, base, factor, 0
+        self._lo, self._hi, self._tail = [], [], np.zeros(0, np.float32)
+
+    def push(self, y):
+        y = np.concatenate([self._tail, np.asarray(y, np.float32)]) if len(self._tail) else np.asarray(y, np.float32)
+        self.n += len(y) - len(self._tail)
+        k = len(y) // self.base * self.base
+        if k:
+            lo, hi = _bins(y[:k], self.base)
+            self._lo.append(lo); self._hi.append(hi)
+        self._tail = y[k:]
+
+    def pyramid(self):
+        lo, hi = list(self._lo), list(self._hi)
+        if len(self._tail): lo.append(self._tail.min(keepdims=True)); hi.append(self._tail.max(keepdims=True))
+        if not lo: lo = hi = [np.zeros(1, np.float32)]
+        return EnvelopePyramid._build(np.concatenate(lo), np.concatenate(hi), self.sr, self.base, self.factor, self.n)
+
+class EnvelopePyramid:
+    def __init__(self, levels, sr, base, factor, n_samples):
+        self.levels, self.sr, self.base, self.factor, self.n_samples = levels, sr, base, factor, n_samples
+
+    @classmethod
+    def _build(cls, lo, hi, sr, base, factor, n_samples, top=512):
+        levels = [(lo, hi)]
+        while len(levels[-1][0]) > top:
+            starts = np.arange(0, len(levels[-1][0]), factor)
+            levels.append((np.minimum.reduceat(levels[-1][0], starts), np.maximum.reduceat(levels[-1][1], starts)))
+        return cls(levels, sr, base, factor, n_samples)
+
+    @classmethod
+    def from_signal(cls, y, sr, base=256, factor=4):
+        return cls._build(*_bins(np.asarray(y, np.float32), base), sr, base, factor, len(y))
+
+    @classmethod
+    def from_source(cls, source, base=256, factor=4, bins_per_block=4096):
+        # Streams a file of any length (path or file object) at its native rate;
+        # only one block of samples is held at a time
+        builder = EnvelopeBuilder(sf.info(source).samplerate, base, factor)
+        if hasattr(source, "seek"): source.seek(0)
+        for block in sf.blocks(source, blocksize=base * bins_per_block, dtype="float32", always_2d=True):
+            builder.push(block.mean(axis=1) if block.shape[1] > 1 else block[:, 0])
+        return builder.pyramid()
+
+    @property
+    def duration(self):
+        return self.n_samples / self.sr
+
+    @property
+    def nbytes(self):
+        return sum(lo.nbytes + hi.nbytes for lo, hi in self.levels)
+
+    def view(self, t0=0.0, t1=None, points=700):
+        # (t, lo, hi) for [t0, t1] seconds with at most `points` bins
+        t1 = self.duration if t1 is None else min(t1, self.duration)
+        i0 = max(0, int(t0 * self.sr / self.base))
+        i1 = max(i0 + 1, int(np.ceil(t1 * self.sr / self.base)))
+        level = 0
+        while level + 1 < len(self.levels) and (i1 - i0) // self.factor**(level + 1) >= points: level += 1
+        scale = self.factor**level
+        a, b = i0 // scale, -(-i1 // scale)
+        lo, hi = self.levels[level]
+        starts, lo, hi = minmax(lo[a:b], hi[a:b], points)
+        return (a + starts) * scale * self.base / self.sr, lo, hi
+
+    def to_dict(self):
+        d = {"sr": self.sr, "base": self.base, "factor": self.factor, "n_samples": self.n_samples}
+        for i, (lo, hi) in enumerate(self.levels): d[f"lo{i}"], d[f"hi{i}"] = lo, hi
+        return d
+
+    @classmethod
+    def from_dict(cls, d):
+        levels = [(d[f"lo{i}"], d[f"hi{i}"]) for i in range(sum(k.startswith("lo") for k in d))]
+        return cls(levels, int(d["sr"]), int(d["base"]), int(d["factor"]), int(d["n_samples"]))
+
+def _envelope_key(audio, key, full):
+    cache = get_cache()
+    return cache.key((key or cache.key(audio, "upload")).encode(), "envelope", full=full)
+
+def put_envelope(audio, pyramid, key=None, full=True):
+    # Caches a pyramid built elsewhere (the background job builds the whole-file one
+    # while it streams the timeline) where load_envelope will find it
+    get_cache().put(_envelope_key(audio, key, full), pyramid.to_dict())
+
+def load_envelope(audio, key=None, full=False):
+    # Cached pyramid for an upload. By default it covers the decoded clip the
+    # classifier sees, which shares load_audio's cache entry. full=True asks for the
+    # whole file, which only the analysis job builds (put_envelope): the page never
+    # decodes a long upload again, and falls back to the clip if it has been evicted.
+    # `key` (e.g. the session's upload key) avoids re-hashing large uploads on every rerun.
+    hit = get_cache().get(_envelope_key(audio, key, full))
+    if hit is not None: return EnvelopePyramid.from_dict(hit)
+    if full: return load_envelope(audio, key)
+    pyramid = EnvelopePyramid.from_signal(*load_audio(audio))
+    put_envelope(audio, pyramid, key, full=False)
+    return pyramid
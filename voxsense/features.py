@@ -0,0 +1,172 @@
+import os
+from contextlib import nullcontext
+import numpy as np
+import librosa
+
+from .audio import SR, decode, get_profile
+from .cache import get_cache
+from .pitch import PITCH_BACKENDS
+from .vad import MIN_SPEECH_FRAMES, speech_mask
+
+N_FFT, HOP = 2048, 512
+MAX_DURATION = 10
+# The one extraction error worth showing a caller as-is; anything else is an exception's text
+TOO_SHORT = "Audio too short — please speak for at least 1 second."
+# piptrack is what the classifier thresholds were tuned on; "yin" gives one f0 per voiced frame
+DEFAULT_PITCH = os.environ.get("VOXSENSE_PITCH", "piptrack")
+# VAD gating drops silent frames before the spectral / pitch / tempo stages. Off by
+# default: the classifier thresholds were tuned on ungated rms_mean / pitch_mean
+DEFAULT_VAD = os.environ.get("VOXSENSE_VAD", "0") == "1"
+# Scalar features (everything but the 40-dim mfcc_mean), as written to CSV / the feature store
+SCALARS = ("pitch_mean", "pitch_std", "pitch_range", "rms_mean", "rms_std", "rms_max",
+           "zcr", "spec_cent", "contrast", "tempo", "duration", "speech_ratio")
+# Stage names, in execution order, passed to the optional `stage(name)` context
+# manager hook of extract_features / features_from_signal
+STAGES = ("decode", "stft", "rms", "zcr", "vad", "mel", "mfcc", "pitch", "tempo", "centroid", "contrast")
+
+def _no_stage(name): return nullcontext()
+
+def load_audio(audio_bytes, duration=MAX_DURATION, use_cache=True, profile=None):
+    # Decodes once per (bytes, duration, profile). The cached float32 buffer is
+    # read-only and handed out as-is, so feature extraction, the waveform chart
+    # and any later stage all share one array without copying.
+    profile = get_profile(profile)
+    if not use_cache: return decode(audio_bytes, duration, profile)
+    cache = get_cache()
+    key   = cache.key(audio_bytes, "decode", duration=duration, profile=profile.name)
+    hit   = cache.get(key)
+    if hit is not None: return hit["y"], hit["sr"]
+    y, sr = decode(audio_bytes, duration, profile)
+    cache.put(key, {"y": y, "sr": sr})
+    return y, sr
+
+def extract_features(audio_bytes, use_cache=True, pitch=None, profile=None, stage=None, store=None, vad=None,
+                     want=None):
+    # store: an optional FeatureStore; files already in it skip decoding entirely
+    # and newly extracted ones are appended to it. want: the features the caller
+    # reads (default: all of FEATURES); only the stages they need are run.
+    try:
+        pitch   = pitch or DEFAULT_PITCH
+        vad     = DEFAULT_VAD if vad is None else bool(vad)
+        want    = None if want is None else tuple(want)
+        profile = get_profile(profile)
+        cache   = get_cache() if use_cache else None
+        key     = cache.key(audio_bytes, "features", duration=MAX_DURATION, pitch=pitch, profile=profile.name,
+                            vad=vad, **({"want": sorted(want)} if want else {})) if cache else None
+        hit     = cache.get(key) if cache else None
+        if hit is not None: return hit, None
+        if store is not None:
+            store.check(pitch, profile.name, vad)
+            stored = store.get(audio_bytes)
+            if stored is not None: return (stored if want is None else {k: stored[k] for k in want}), None
+        stage   = stage or _no_stage
+        with stage("decode"):
+            y, sr = load_audio(audio_bytes, use_cache=use_cache, profile=profile)
+        if len(y) < sr * 0.5:
+            return None, TOO_SHORT
+        features = features_from_signal(y, sr, pitch, stage, vad, want)
+        # Store rows are complete feature sets, so partial extractions are not added
+        if store is not None and want is None: store.add(audio_bytes, features)
+        if cache: cache.put(key, features)
+        return dict(features), None
+    except Exception as e:
+        return None, f"Processing error: {str(e)}"
+
+def contrast_bands(sr):
+    # librosa's default 6 octave bands from 200 Hz need sr > 12.8 kHz; native
+    # telephony rates get as many bands as fit under Nyquist
+    return int(min(6, np.ceil(np.log2(sr / 400))))
+
+# Lazy feature graph. Every node is one stage: it reads the intermediates in `v`
+# (the signal y, then S, rms, zcr, mel_db, …) and adds its own. A request for
+# some FEATURES evaluates only the nodes those features need, plus their
+# dependencies, in STAGES order. Intermediates are computed once and shared:
+# mel_db feeds both mfcc and tempo, and S feeds mel, pitch, centroid and contrast.
+# With VAD gating on, every node downstream of S / rms / zcr also depends on
+# "vad", which runs after them (STAGES order) and narrows all three to speech frames.
+def _stft(v, sr, pitch):     v["S"] = np.abs(librosa.stft(v["y"], n_fft=N_FFT, hop_length=HOP))
+def _rms(v, sr, pitch):      v["rms"] = librosa.feature.rms(y=v["y"], frame_length=N_FFT, hop_length=HOP)
+def _zcr(v, sr, pitch):      v["zcr"] = librosa.feature.zero_crossing_rate(v["y"])
+def _mel(v, sr, pitch):      v["mel_db"] = librosa.power_to_db(librosa.feature.melspectrogram(S=v["S"]**2, sr=sr))
+def _mfcc(v, sr, pitch):     v["mfcc"] = librosa.feature.mfcc(S=v["mel_db"], n_mfcc=40)
+def _pitch(v, sr, pitch):    v["pv"] = PITCH_BACKENDS[pitch](v["y"], sr, v.get("S"), v.get("gate"))
+def _centroid(v, sr, pitch): v["cent"] = librosa.feature.spectral_centroid(S=v["S"], sr=sr)
+
+def _vad(v, sr, pitch):
+    v["speech"] = speech_mask(v["rms"][0], v["zcr"][0])
+    gate = v["speech"] if v["vad"] and v["speech"].sum() >= MIN_SPEECH_FRAMES else None
+    if gate is None: return
+    v["gate"] = gate
+    for k in ("S", "rms", "zcr"):
+        if k in v: v[k] = v[k][:, gate]
+
+def _tempo(v, sr, pitch):
+    onset = librosa.onset.onset_strength(S=v["mel_db"], sr=sr, aggregate=np.median)
+    v["tempo"], _ = librosa.beat.beat_track(onset_envelope=onset, sr=sr, hop_length=HOP)
+
+def _contrast(v, sr, pitch):
+    v["contrast"] = librosa.feature.spectral_contrast(S=v["S"], sr=sr, n_bands=contrast_bands(sr))
+
+# node: (fn, dependencies, reads S / rms / zcr and so is gated by VAD)
+NODES = {
+    "stft":     (_stft,     (),              False),
+    "rms":      (_rms,      (),              False),
+    "zcr":      (_zcr,      (),              False),
+    "vad":      (_vad,      ("rms", "zcr"),  False),
+    "mel":      (_mel,      ("stft",),       True),
+    "mfcc":     (_mfcc,     ("mel",),        False),
+    "pitch":    (_pitch,    (),              True),
+    "tempo":    (_tempo,    ("mel",),        False),
+    "centroid": (_centroid, ("stft",),       True),
+    "contrast": (_contrast, ("stft",),       True),
+}
+_pv = lambda fn: lambda v, sr: float(fn(v["pv"])) if len(v["pv"]) else 0.0
+# feature: (value from the intermediates, nodes it needs, gated by VAD)
+OUTPUTS = {
+    "mfcc_mean":    (lambda v, sr: np.mean(v["mfcc"], axis=1),           ("mfcc",),     False),
+    "pitch_mean":   (_pv(np.mean),                                       ("pitch",),    False),
+    "pitch_std":    (_pv(np.std),                                        ("pitch",),    False),
+    "pitch_range":  (_pv(np.ptp),                                        ("pitch",),    False),
+    "rms_mean":     (lambda v, sr: float(np.mean(v["rms"])),             ("rms",),      True),
+    "rms_std":      (lambda v, sr: float(np.std(v["rms"])),              ("rms",),      True),
+    "rms_max":      (lambda v, sr: float(np.max(v["rms"])),              ("rms",),      True),
+    "zcr":          (lambda v, sr: float(np.mean(v["zcr"])),             ("zcr",),      True),
+    "spec_cent":    (lambda v, sr: float(np.mean(v["cent"])),            ("centroid",), False),
+    "contrast":     (lambda v, sr: float(np.mean(v["contrast"])),        ("contrast",), False),
+    "tempo":        (lambda v, sr: float(np.squeeze(v["tempo"])),        ("tempo",),    False),
+    "duration":     (lambda v, sr: len(v["y"])/sr,                       (),            False),
+    "speech_ratio": (lambda v, sr: float(np.mean(v["speech"])),          ("vad",),      False),
+}
+FEATURES = tuple(OUTPUTS)
+
+def plan(want=None, pitch=None, vad=None):
+    # Nodes features_from_signal evaluates for `want` (default: every feature), in run order
+    pitch = pitch or DEFAULT_PITCH
+    vad   = DEFAULT_VAD if vad is None else vad
+    def deps(node):
+        fn, needs, gated = NODES[node]
+        if node == "pitch" and pitch == "piptrack": needs = ("stft",)   # piptrack reads S; YIN works on y
+        return needs + (("vad",) if gated and vad else ())
+    need, todo = set(), []
+    for k in FEATURES if want is None else want:
+        todo += OUTPUTS[k][1] + (("vad",) if OUTPUTS[k][2] and vad else ())
+    while todo:
+        node = todo.pop()
+        if node not in need:
+            need.add(node)
+            todo += deps(node)
+    return tuple(node for node in STAGES if node in need)
+
+def features_from_signal(y, sr, pitch=None, stage=None, vad=None, want=None):
+    # Evaluates plan(want) and returns {feature: value} for `want`, in FEATURES
+    # order by default. rms, zcr and S share one frame grid (N_FFT / HOP,
+    # centred), so one VAD mask gates all of them; tempo then reflects the pace
+    # of speech with the pauses cut out.
+    stage = stage or _no_stage
+    pitch = pitch or DEFAULT_PITCH
+    vad   = DEFAULT_VAD if vad is None else vad
+    want  = FEATURES if want is None else tuple(want)
+    v     = {"y": y, "vad": vad}
+    for node in plan(want, pitch, vad):
+        with stage(node): NODES[node][0](v, sr, pitch)
+    return {k: OUTPUTS[k][0](v, sr) for k in want}
@@ -0,0 +1,269 @@
+import io
+import os
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .channels import analyse_signals, channel_timeline, load_channels
+from .classify import DEFAULT_LANGUAGE, FEATURE_COLUMNS
+from .features import MAX_DURATION, SR, TOO_SHORT, _no_stage, extract_features, plan
+from .envelope import EnvelopeBuilder, put_envelope
+from .metrics import METRICS_FILE, get_metrics
+from .model import get_classifier, with_inputs
+from .stream import analyse_stream, channels_of, duration_of
+
+# Background analysis for the UI. The Analyse button submits a job and returns at
+# once; the page polls the job and shows the result when it is ready, so a long
+# upload never holds up a script run. One queue per process is shared by every
+# session:
+#   - a bounded pool of worker threads (the cache and the decoded buffers stay shared)
+#   - at most max_pending jobs queued or running; submit() raises QueueFull beyond that
+#   - cancellation: queued jobs never start, running ones stop at the next stage boundary
+# With state_dir set, every job is also written there as <id>.json (status and result)
+# plus <id>.audio until it finishes. Other processes can poll it by id, and jobs left
+# queued or running by a restart are picked up again. No broker is involved.
+# A finished job's result (a long call's timeline included) is held only until the UI
+# release()s it, or for JOB_RESULT_TTL seconds if nobody comes back for it.
+JOB_WORKERS     = int(os.environ.get("VOXSENSE_JOB_WORKERS", min(2, os.cpu_count() or 1)))
+JOB_MAX_PENDING = int(os.environ.get("VOXSENSE_JOB_QUEUE", 8))
+JOB_DIR         = os.environ.get("VOXSENSE_JOB_DIR") or None
+JOB_RESULT_TTL  = float(os.environ.get("VOXSENSE_JOB_RESULT_TTL", 600))
+# Progress steps: the extraction stages analyse_upload runs, classification, then the long-recording
+# timeline. mfcc_mean is included so a trained model's stages are listed without loading it at import.
+STEPS = ("decode",) + plan(FEATURE_COLUMNS + ("mfcc_mean",)) + ("classify", "timeline")
+
+class QueueFull(RuntimeError): pass
+
+class Cancelled(Exception): pass
+
+def analyse_upload(audio_bytes, lang_key=DEFAULT_LANGUAGE, stage=None, progress=None, want=FEATURE_COLUMNS):
+    # Everything the Analyse button shows, as one JSON-ready dict: (result, error).
+    # progress(fraction) is called after each timeline window of a long recording.
+    # Only `want` and the classifier's inputs are extracted.
+    try: full, n_ch = duration_of(io.BytesIO(audio_bytes)), channels_of(io.BytesIO(audio_bytes))
+    except Exception: full, n_ch = 0, 1
+    result, error = (_analyse_multichannel if n_ch > 1 else _analyse_mono)(audio_bytes, lang_key, stage, want)
+    if error: return None, error
+    if full > MAX_DURATION:
+        # The timeline pass reads the whole file anyway, so it also bins the waveform
+        # envelope the page draws: the UI never decodes a long upload itself
+        timeline, envelope = [], EnvelopeBuilder(SR)
+        def tap(start, y):
+            new = y[..., max(0, envelope.n - int(round(start * SR))):]
+            if new.shape[-1]: envelope.push(new.mean(axis=0) if new.ndim > 1 else new)
+        windows  = (channel_timeline(io.BytesIO(audio_bytes), lang_key, want=(), tap=tap) if n_ch > 1
+                    else analyse_stream(io.BytesIO(audio_bytes), lang_key, want=(), tap=tap))
+        for w in windows:
+            row = {k: w[k] for k in ("start", "end", "emotion", "confidence") if k in w}
+            if n_ch > 1: row["channels"] = [{k: c[k] for k in ("label", "emotion", "confidence")}
+                                            for c in w["channels"]]
+            timeline.append(row)
+            if progress: progress(min(1.0, w["end"] / full))
+        result["timeline"] = timeline
+        put_envelope(audio_bytes, envelope.pyramid())
+    return result, None
+
+def _analyse_mono(audio_bytes, lang_key, stage, want):
+    classifier = get_classifier()
+    features, error = extract_features(audio_bytes, stage=stage, want=with_inputs(want, classifier))
+    if error: return None, error
+    with (stage or _no_stage)("classify"):
+        emotion, probs = classifier.classify(features, lang_key)
+    return {"emotion": emotion, "confidence": round(probs[emotion]*100, 1), "probs": probs,
+            "features": {k: float(features[k]) for k in want}}, None
+
+def _analyse_multichannel(audio_bytes, lang_key, stage, want):
+    # Stereo calls (agent / customer on separate channels): one decode, one result per
+    # speaker. A downmix blends both voices, so the headline is the speaker whose
+    # result is the most confident rather than the mix, and `speaker` names it.
+    stage = stage or _no_stage
+    try:
+        with stage("decode"):
+            Y, sr = load_channels(audio_bytes)
+        if Y.shape[1] < sr * 0.5: return None, TOO_SHORT
+        results = analyse_signals(Y, sr, lang_key, stage=stage, want=want)
+    except Cancelled: raise
+    except Exception as e: return None, f"Processing error: {str(e)}"
+    with stage("classify"):
+        top = max(results, key=lambda r: r["confidence"])
+    return {"emotion": top["emotion"], "confidence": top["confidence"], "probs": top["probs"],
+            "speaker": top["label"], "features": {k: float(top["features"][k]) for k in want},
+            "channels": [{k: r[k] for k in ("label", "emotion", "confidence")} for r in results]}, None
+
+class Job:
+    def __init__(self, job_id, lang_key, submitted=None):
+        self.id, self.lang_key = job_id, lang_key
+        self.status, self.stage, self.progress = "queued", None, 0.0
+        self.submitted, self.started, self.finished = submitted or time.time(), None, None
+        self.result = self.error = None
+        self.owner = os.getpid()
+        self._cancel, self._future = threading.Event(), None
+
+    @property
+    def done(self):
+        return self.status in ("done", "error", "cancelled")
+
+    def to_dict(self):
+        return {"id": self.id, "lang_key": self.lang_key, "status": self.status, "stage": self.stage,
+                "progress": round(self.progress, 3), "submitted": self.submitted, "started": self.started,
+                "finished": self.finished, "result": self.result, "error": self.error, "owner": self.owner}
+
+    @classmethod
+    def from_dict(cls, d):
+        job = cls(d["id"], d["lang_key"], d["submitted"])
+        for k in ("status", "stage", "progress", "started", "finished", "result", "error", "owner"): setattr(job, k, d[k])
+        return job
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING, state_dir=JOB_DIR, keep=256,
+                 result_ttl=JOB_RESULT_TTL):
+        self.max_pending, self.state_dir, self.keep, self.result_ttl = max_pending, state_dir, keep, result_ttl
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="voxsense-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.submitted = self.rejected = 0
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+            self._recover()
+
+    def pending(self):
+        return sum(not job.done for job in list(self._jobs.values()))
+
+    def submit(self, audio_bytes, lang_key=DEFAULT_LANGUAGE):
+        # Returns the new job's id; raises QueueFull instead of queueing without bound
+        with self._lock:
+            pending = self.pending()
+            if pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFull(f"{pending} analyses are already queued or running — please try again shortly.")
+            job = Job(uuid.uuid4().hex[:12], lang_key)
+            self._jobs[job.id] = job
+            self.submitted += 1
+            self._trim()
+        if self.state_dir:
+            with open(self._file(job.id, "audio"), "wb") as fh: fh.write(audio_bytes)
+            self._save(job)
+        job._future = self._pool.submit(self._run, job, audio_bytes)
+        return job.id
+
+    def get(self, job_id):
+        # The Job, or None for an unknown id; with state_dir, jobs of other processes are read from disk
+        job = self._jobs.get(job_id)
+        if job is not None or not self.state_dir: return job
+        try:
+            with open(self._file(job_id, "json")) as fh: return Job.from_dict(json.load(fh))
+        except (OSError, ValueError, KeyError): return None
+
+    def cancel(self, job_id):
+        # True if the job was still queued or running. A running job stops at its next
+        # stage boundary; its status turns "cancelled" once it has.
+        job = self._jobs.get(job_id)
+        if job is None or job.done: return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel(): self._finish(job, "cancelled")
+        return True
+
+    def release(self, job_id):
+        # Drops a finished job's result once its caller has taken it; the status stays
+        job = self._jobs.get(job_id)
+        if job is None or not job.done or job.result is None: return
+        job.result = None
+        self._save(job)
+
+    def stats(self):
+        counts = {}
+        for job in list(self._jobs.values()): counts[job.status] = counts.get(job.status, 0) + 1
+        return {"pending": self.pending(), "max_pending": self.max_pending, "submitted": self.submitted,
+                "rejected": self.rejected, **counts}
+
+    def _run(self, job, audio_bytes):
+        if job._cancel.is_set(): return self._finish(job, "cancelled")
+        job.status, job.started = "running", time.time()
+        self._save(job)
+        get_metrics().observe("queue_wait", job.started - job.submitted)
+        def on_done(name, seconds):
+            job.stage, job.progress = name, (STEPS.index(name) + 1) / len(STEPS)
+            if job._cancel.is_set(): raise Cancelled(job.id)
+        def on_window(fraction):
+            job.stage, job.progress = "timeline", (len(STEPS) - 1 + fraction) / len(STEPS)
+            if job._cancel.is_set(): raise Cancelled(job.id)
+        try:
+            job.result, job.error = analyse_upload(audio_bytes, job.lang_key, get_metrics().stage_hook(on_done), on_window)
+        except Cancelled: pass
+        except Exception as e: job.error = f"Processing error: {str(e)}"
+        get_metrics().record_startup("first_request", time.time() - job.started)
+        if METRICS_FILE: get_metrics().write(METRICS_FILE)
+        # extract_features reports a cancellation raised inside it as an error string
+        self._finish(job, "cancelled" if job._cancel.is_set() else "error" if job.error else "done")
+
+    def _finish(self, job, status):
+        job.status, job.finished = status, time.time()
+        if status == "done": job.progress = 1.0
+        if status == "cancelled": job.result = job.error = None
+        self._save(job)
+        if self.state_dir:
+            try: os.remove(self._file(job.id, "audio"))
+            except OSError: pass
+        with self._lock: self._trim()
+
+    def _trim(self):
+        # Forgets the oldest finished jobs beyond `keep` (their files too) and drops
+        # results nobody released within result_ttl. Runs on every submit and finish.
+        stale = time.time() - self.result_ttl
+        for job in list(self._jobs.values()):
+            if job.done and job.result is not None and job.finished < stale:
+                job.result = None
+                self._save(job)
+        done = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in done[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[job_id]
+            if self.state_dir:
+                try: os.remove(self._file(job_id, "json"))
+                except OSError: pass
+
+    def _file(self, job_id, ext):
+        return os.path.join(self.state_dir, f"{job_id}.{ext}")
+
+    def _save(self, job):
+        if not self.state_dir: return
+        tmp = self._file(job.id, f"json.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh: json.dump(job.to_dict(), fh, ensure_ascii=False)
+        os.replace(tmp, self._file(job.id, "json"))
+
+    def _recover(self):
+        # Requeues jobs that a process which has since exited left queued or running, oldest first
+        found = []
+        for name in os.listdir(self.state_dir):
+            if not name.endswith(".json"): continue
+            try:
+                with open(os.path.join(self.state_dir, name)) as fh: job = Job.from_dict(json.load(fh))
+            except (OSError, ValueError, KeyError): continue
+            if not job.done and not _alive(job.owner): found.append(job)
+        for job in sorted(found, key=lambda job: job.submitted):
+            try:
+                with open(self._file(job.id, "audio"), "rb") as fh: audio_bytes = fh.read()
+            except OSError:
+                job.error = "Audio for this job was lost in a restart."
+                self._finish(job, "error")
+                continue
+            job.status, job.stage, job.progress, job.started, job.owner = "queued", None, 0.0, None, os.getpid()
+            self._jobs[job.id] = job
+            job._future = self._pool.submit(self._run, job, audio_bytes)
+
+def _alive(pid):
+    try: os.kill(pid, 0)
+    except ProcessLookupError: return False
+    except OSError: pass
+    return True
+
+_jobs, _jobs_lock = None, threading.Lock()
+
+def get_jobs():
+    # Process-wide, like get_cache(): every Streamlit session submits to this one queue
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None: _jobs = JobQueue()
+        return _jobs
@@ -0,0 +1,54 @@
+import time
+import asyncio
+import numpy as np
+from urllib.parse import urlsplit
+
+async def _request(reader, writer, method, path, host, body):
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\n"
+                  "Connection: keep-alive\r\n\r\n").encode() + body)
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = {k.strip().lower(): v.strip() for k, v in (l.split(":", 1) for l in head[1:] if ":" in l)}
+    payload = await reader.readexactly(int(headers.get("content-length", 0)))
+    return int(head[0].split(" ")[1]), payload, headers.get("connection", "").lower() == "close"
+
+async def _client(url, body, method, queue, results):
+    # One keep-alive connection per simulated client; reconnects if the server closes it
+    u = urlsplit(url)
+    path = u.path + (f"?{u.query}" if u.query else "")
+    conn = None
+    while True:
+        try: queue.get_nowait()
+        except asyncio.QueueEmpty: break
+        t0 = time.perf_counter()
+        try:
+            if conn is None: conn = await asyncio.open_connection(u.hostname, u.port or 80)
+            status, _, closed = await _request(*conn, method, path, u.netloc, body)
+            if closed: conn[1].close(); conn = None
+        except (OSError, asyncio.IncompleteReadError) as e:
+            status = type(e).__name__
+            if conn: conn[1].close()
+            conn = None
+        results.append((status, (time.perf_counter() - t0) * 1000))
+    if conn: conn[1].close()
+
+async def run_load(url, body=b"", method="POST", requests=200, concurrency=16):
+    queue = asyncio.Queue()
+    for _ in range(requests): queue.put_nowait(None)
+    results = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(url, body, method, queue, results) for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    ok  = np.array([ms for status, ms in results if status == 200])
+    out = {"requests": len(results), "concurrency": concurrency, "wall_s": round(wall, 3),
+           "ok": len(ok), "rejected_429": sum(status == 429 for status, _ in results),
+           "errors": sum(status not in (200, 429) for status, _ in results),
+           "rps": round(len(ok) / wall, 1) if wall else 0.0}
+    if len(ok):
+        out.update({f"p{q}_ms": round(float(np.percentile(ok, q)), 2) for q in (50, 90, 99)})
+        out["max_ms"] = round(float(ok.max()), 2)
+    return out
+
+def load_test(url, path=None, method="POST", requests=200, concurrency=16):
+    body = open(path, "rb").read() if path else b""
+    return asyncio.run(run_load(url, body, method, requests, concurrency))
@@ -0,0 +1,108 @@
+import os
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Per-stage latency histograms for the analysis hot path (the extract_features
+# stages plus "classify"), exported in the Prometheus text exposition format 0.0.4.
+# Bucket upper bounds are in seconds and sized for a 10 s clip, where a stage
+# usually takes tens of milliseconds.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRICS_FILE = os.environ.get("VOXSENSE_METRICS_FILE") or None
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def stage_timer(on_done):
+    # stage(name) hook for extract_features: calls on_done(name, seconds) as each
+    # stage finishes. Stages that raise are not reported.
+    @contextmanager
+    def stage(name):
+        t0 = time.perf_counter()
+        yield
+        on_done(name, time.perf_counter() - t0)
+    return stage
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts  = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum     = 0.0
+        self.count   = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.sum   += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation; None when empty
+        if not self.count: return None
+        rank, seen = q * self.count, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            seen += n
+            if seen >= rank: return bound
+        return float("inf")
+
+class Metrics:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.startup = {}
+        self._hist   = {}
+        self._lock   = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            if stage not in self._hist: self._hist[stage] = Histogram(self.buckets)
+            self._hist[stage].observe(seconds)
+
+    def record_startup(self, phase, seconds):
+        # Cold-start gauges (import, warmup, first_request); only the first value per phase is kept
+        with self._lock: self.startup.setdefault(phase, seconds)
+
+    def stage_hook(self, on_done=None):
+        # Records every stage here and, if given, also calls on_done(name, seconds),
+        # e.g. to advance a progress bar as real work completes
+        def done(name, seconds):
+            self.observe(name, seconds)
+            if on_done: on_done(name, seconds)
+        return stage_timer(done)
+
+    def summary(self):
+        with self._lock:
+            return {stage: {"count": h.count, "mean_ms": round(1000 * h.sum / h.count, 2),
+                            "p50_le_ms": 1000 * h.quantile(0.5), "p95_le_ms": 1000 * h.quantile(0.95)}
+                    for stage, h in self._hist.items()}
+
+    def render(self):
+        lines = ["# HELP voxsense_stage_seconds Wall time of each analysis stage.",
+                 "# TYPE voxsense_stage_seconds histogram"]
+        with self._lock:
+            for stage, h in sorted(self._hist.items()):
+                cumulative = 0
+                for bound, n in zip(h.buckets + (float("inf"),), h.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'voxsense_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'voxsense_stage_seconds_sum{{stage="{stage}"}} {h.sum!r}')
+                lines.append(f'voxsense_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            if self.startup:
+                lines += ["# HELP voxsense_startup_seconds Cold-start timings of this process.",
+                          "# TYPE voxsense_startup_seconds gauge"]
+                lines += [f'voxsense_startup_seconds{{phase="{phase}"}} {seconds!r}'
+                          for phase, seconds in self.startup.items()]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # Atomic replace, so a node_exporter textfile collector never reads a partial file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh: fh.write(self.render())
+        os.replace(tmp, path)
+
+_metrics, _metrics_lock = None, threading.Lock()
+
+def get_metrics():
+    # Process-wide, like get_cache(): every Streamlit session / request feeds one set
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None: _metrics = Metrics()
+        return _metrics
@@ -0,0 +1,151 @@
+import os
+import threading
+import numpy as np
+
+from .classify import (DEFAULT_LANGUAGE, EMOTION_NAMES, FEATURE_COLUMNS, calibration, classify_batch,
+                       classify_emotion, feature_matrix, _round3)
+
+# Classifier backends. Both return what classify_emotion / classify_batch return:
+# (emotion, {emotion: probability}) for one clip and an N × 6 matrix (columns follow
+# EMOTION_NAMES) for a batch. `features` lists what each backend reads, so
+# callers pass it to extract_features(want=...).
+#   RuleClassifier   the language-calibrated RULES (default; what the app ships with)
+#   EmotionModel     a trained scikit-learn estimator over mfcc_mean + FEATURE_COLUMNS,
+#                    loaded once per process from VOXSENSE_MODEL
+# pitch_mean and rms_mean go through the same language calibration as the rules
+# before a model sees them, so training and inference both use calibrated features.
+MODEL_PATH    = os.environ.get("VOXSENSE_MODEL") or None
+N_MFCC        = 40
+MODEL_COLUMNS = tuple(f"mfcc_{i}" for i in range(N_MFCC)) + FEATURE_COLUMNS
+
+class RuleClassifier:
+    name     = "rules"
+    features = FEATURE_COLUMNS
+
+    def classify(self, features, lang_key=DEFAULT_LANGUAGE):
+        return classify_emotion(features, lang_key)
+
+    def classify_batch(self, rows, lang_keys=DEFAULT_LANGUAGE):
+        return classify_batch(feature_matrix(rows), lang_keys)
+
+    def classify_columns(self, features, n, lang_keys=DEFAULT_LANGUAGE):
+        return classify_batch(np.column_stack([np.broadcast_to(features[c], n) for c in FEATURE_COLUMNS]), lang_keys)
+
+def model_matrix(rows, lang_keys=DEFAULT_LANGUAGE, columns=MODEL_COLUMNS):
+    # Feature dicts → N × len(columns) float64, mfcc_mean spread over mfcc_<i>, calibrated
+    names = dict.fromkeys("mfcc_mean" if c.startswith("mfcc_") else c for c in columns)
+    return column_matrix({k: [r[k] for r in rows] for k in names}, len(rows), lang_keys, columns)
+
+def column_matrix(features, n, lang_keys=DEFAULT_LANGUAGE, columns=MODEL_COLUMNS):
+    # As model_matrix, from per-feature columns of n rows ({"mfcc_mean": n × 40, "zcr": n, ...}),
+    # e.g. a FeatureStore's memory maps, without building a dict per row
+    X    = np.empty((n, len(columns)))
+    mfcc = [(j, int(c[5:])) for j, c in enumerate(columns) if c.startswith("mfcc_")]
+    if mfcc and n:
+        cols, coef = zip(*mfcc)
+        X[:, cols] = np.asarray(features["mfcc_mean"], dtype=np.float64).reshape(n, -1)[:, coef]
+    for j, c in enumerate(columns):
+        if not c.startswith("mfcc_"): X[:, j] = features[c]
+    offset, scale = calibration(lang_keys)
+    if "pitch_mean" in columns:
+        i = columns.index("pitch_mean")
+        X[:, i] = np.maximum(X[:, i] - offset, 0)
+    if "rms_mean" in columns:
+        i = columns.index("rms_mean")
+        X[:, i] *= scale
+    return X
+
+class EmotionModel:
+    def __init__(self, estimator, columns=MODEL_COLUMNS):
+        self.estimator, self.columns = estimator, tuple(columns)
+        self.features = tuple(dict.fromkeys("mfcc_mean" if c.startswith("mfcc_") else c for c in self.columns))
+        self.name     = type(estimator[-1] if hasattr(estimator, "steps") else estimator).__name__
+        # Model classes → EMOTION_NAMES positions; emotions the model never saw stay at 0
+        self._slots   = np.array([EMOTION_NAMES.index(c) for c in estimator.classes_])
+
+    def predict_proba(self, X):
+        P = np.zeros((len(X), len(EMOTION_NAMES)))
+        if len(X): P[:, self._slots] = self.estimator.predict_proba(X)
+        return _round3(P)
+
+    def classify_batch(self, rows, lang_keys=DEFAULT_LANGUAGE):
+        return self.predict_proba(model_matrix(rows, lang_keys, self.columns))
+
+    def classify_columns(self, features, n, lang_keys=DEFAULT_LANGUAGE):
+        return self.predict_proba(column_matrix(features, n, lang_keys, self.columns))
+
+    def classify(self, features, lang_key=DEFAULT_LANGUAGE):
+        probs = dict(zip(EMOTION_NAMES, self.classify_batch([features], lang_key)[0].tolist()))
+        return max(probs, key=probs.get), probs
+
+    # Compact format (.npz): a StandardScaler + LogisticRegression pipeline (or a bare
+    # LogisticRegression) stored as its fitted arrays only, about 4.5 KB for 6 classes.
+    # Loading takes about 1.5 ms and rebuilds real sklearn objects without unpickling
+    # anything, so a model file cannot run code and does not depend on the
+    # sklearn version that trained it. Any other estimator (forests, SVMs, …) is
+    # saved and loaded with joblib instead.
+    def save(self, path):
+        if not path.endswith(".npz"):
+            import joblib
+            joblib.dump({"estimator": self.estimator, "columns": self.columns}, path)
+            return
+        from sklearn.linear_model import LogisticRegression
+        steps  = self.estimator.steps if hasattr(self.estimator, "steps") else [("clf", self.estimator)]
+        scaler = steps[0][1] if len(steps) == 2 else None
+        clf    = steps[-1][1]
+        if not isinstance(clf, LogisticRegression) or len(steps) > 2 or (scaler is not None and not hasattr(scaler, "mean_")):
+            raise ValueError(f"{path}: .npz holds a [StandardScaler +] LogisticRegression; use .joblib for {self.name}")
+        arrays = {"columns": np.array(" ".join(self.columns)), "classes": np.array(" ".join(map(str, clf.classes_))),
+                  "coef": clf.coef_, "intercept": clf.intercept_}
+        if scaler is not None: arrays.update(mean=scaler.mean_, scale=scaler.scale_)
+        with open(path, "wb") as fh: np.savez_compressed(fh, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        if not path.endswith(".npz"):
+            import joblib
+            d = joblib.load(path)
+            return cls(d["estimator"], d["columns"])
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        with np.load(path, allow_pickle=False) as z:
+            clf = LogisticRegression()
+            clf.classes_ = np.array(str(z["classes"]).split(), dtype=object)
+            clf.coef_, clf.intercept_ = z["coef"], z["intercept"]
+            clf.n_features_in_ = z["coef"].shape[1]
+            estimator = clf
+            if "mean" in z.files:
+                scaler = StandardScaler()
+                scaler.mean_, scaler.scale_, scaler.var_ = z["mean"], z["scale"], z["scale"]**2
+                scaler.n_features_in_, scaler.n_samples_seen_ = len(z["mean"]), 0
+                estimator = make_pipeline(scaler, clf)
+            return cls(estimator, tuple(str(z["columns"]).split()))
+
+def fit_model(rows, labels, lang_keys=DEFAULT_LANGUAGE, estimator=None):
+    # Trains on feature dicts (extract_features(want=EmotionModel features)) and their emotion labels.
+    # The default is the pipeline the compact .npz format holds.
+    if estimator is None:
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        estimator = make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000))
+    unknown = set(labels) - set(EMOTION_NAMES)
+    if unknown: raise ValueError(f"unknown emotion labels {sorted(unknown)} — expected {', '.join(EMOTION_NAMES)}")
+    estimator.fit(model_matrix(rows, lang_keys), np.asarray(labels, dtype=object))
+    return EmotionModel(estimator)
+
+def with_inputs(want, classifier=None):
+    # `want` plus the features the classifier reads; None (every feature) stays None
+    if want is None: return None
+    return tuple(dict.fromkeys(tuple(want) + (classifier or get_classifier()).features))
+
+_classifiers, _classifiers_lock = {}, threading.Lock()
+
+def get_classifier(path=None):
+    # Process-wide, like get_cache(): the model at `path` (default $VOXSENSE_MODEL) is
+    # loaded once and shared by every session / request; no path means the rules
+    path = path or MODEL_PATH
+    with _classifiers_lock:
+        if path not in _classifiers: _classifiers[path] = EmotionModel.load(path) if path else RuleClassifier()
+        return _classifiers[path]
@@ -0,0 +1,69 @@
+import numpy as np
+import librosa
+import scipy.fft
+
+# Pitch backends: fn(y, sr, S, mask) → 1-D array of pitch values the pitch_* features
+# are computed over. S is the shared magnitude spectrogram from features_from_signal,
+# already reduced to speech frames when VAD gating is on; mask is that frame mask
+# (None when ungated) for backends that work on y directly.
+
+def piptrack_values(y, sr, S, mask=None, n_fft=2048, hop_length=512):
+    # Every positive piptrack bin: many candidates per frame, harmonics included
+    pitches, _ = librosa.piptrack(S=S, sr=sr, n_fft=n_fft, hop_length=hop_length)
+    return pitches[pitches > 0]
+
+def _yin_block(frames, power, sr, min_lag, max_lag, threshold):
+    # frames: n × frame_length, one frame per row; power: n × (max_lag + 1), the energy of
+    # the frame's first `win` samples shifted by each lag → (f0, aperiodicity) per row
+    win = frames.shape[1] - max_lag
+    n   = scipy.fft.next_fast_len(frames.shape[1], real=True)
+    acf = scipy.fft.irfft(scipy.fft.rfft(frames, n, axis=1) * np.conj(scipy.fft.rfft(frames[:, :win], n, axis=1)),
+                          n, axis=1)[:, :max_lag + 1]
+    diff = np.maximum(power[:, :1] + power - 2 * acf, 0)
+    cum  = np.cumsum(diff[:, 1:], axis=1)
+    lags = np.arange(1, max_lag + 1, dtype=frames.dtype)
+    cmnd = np.where(cum > 0, diff[:, 1:] * lags / np.where(cum > 0, cum, 1), 1)
+    search = cmnd[:, min_lag - 1:]
+    troughs = librosa.util.localmin(search, axis=1) & (search < threshold)
+    lag  = np.where(troughs.any(axis=1), np.argmax(troughs, axis=1), np.argmin(search, axis=1))
+    rows = np.arange(len(search))
+    best = search[rows, lag]
+    lo = search[rows, np.maximum(lag - 1, 0)]
+    hi = search[rows, np.minimum(lag + 1, search.shape[1] - 1)]
+    denom = lo - 2 * best + hi
+    shift = np.clip(0.5 * (lo - hi) / np.where(np.abs(denom) > 1e-12, denom, np.inf), -1, 1)
+    return sr / (lag + min_lag + shift), best
+
+def yin_track(y, sr, fmin=65.0, fmax=600.0, frame_length=1024, hop_length=512, threshold=0.15, block=256,
+              mask=None):
+    # Vectorised YIN: one f0 per frame plus its aperiodicity (the CMND trough).
+    # Frames are strided row views, `block` at a time, with an FFT autocorrelation of
+    # frame_length points (enough for lags up to sr / fmin without wrap-around). The
+    # shifted-window energies come from one cumulative sum over the block's samples.
+    # Time is linear in the frame count and scratch memory is bounded by the block.
+    min_lag = max(1, int(np.floor(sr / fmax)))
+    max_lag = min(frame_length - 1, int(np.ceil(sr / fmin)))
+    win = frame_length - max_lag
+    y = np.pad(np.asarray(y, dtype=np.float32), frame_length // 2)
+    frames = librosa.util.frame(y, frame_length=frame_length, hop_length=hop_length, axis=0)
+    if mask is not None: mask = mask[:len(frames)]                     # only gated frames are ever evaluated
+    n = len(frames) if mask is None else int(np.count_nonzero(mask))
+    f0, aperiodicity, j = np.empty(n), np.empty(n), 0
+    for i in range(0, len(frames), block):
+        keep = slice(None) if mask is None else mask[i:i + block]
+        if mask is not None and not keep.any(): continue
+        c = np.cumsum(np.square(y[i * hop_length:(i + block - 1) * hop_length + frame_length], dtype=np.float64))
+        c = np.concatenate([[0.0], c])
+        power = librosa.util.frame((c[win:] - c[:-win]).astype(np.float32), frame_length=max_lag + 1,
+                                   hop_length=hop_length, axis=0)
+        f, a = _yin_block(frames[i:i + block][keep], power[keep], sr, min_lag, max_lag, threshold)
+        f0[j:j + len(f)], aperiodicity[j:j + len(f)] = f, a
+        j += len(f)
+    return f0, aperiodicity
+
+def yin_values(y, sr, S=None, mask=None, threshold=0.15):
+    # One f0 per voiced frame; frames whose best trough misses the threshold are unvoiced
+    f0, aperiodicity = yin_track(y, sr, threshold=threshold, mask=mask)
+    return f0[aperiodicity < threshold]
+
+PITCH_BACKENDS = {"piptrack": piptrack_values, "yin": yin_values}
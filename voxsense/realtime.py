@@ -0,0 +1,160 @@
+import time
+import numpy as np
+from collections import deque
+import librosa
+import soxr
+
+from .classify import DEFAULT_LANGUAGE
+from .features import N_FFT, HOP, SR
+from .model import get_classifier
+from .vad import speech_mask
+
+# Per-frame statistics kept in the ring. Pitch is stored as sufficient statistics
+# (sum, sum of squares, count, min, max of the piptrack candidates) so the mean,
+# std and range over the whole window are exact, not averages of averages.
+_COLS = ("rms", "zcr", "cent", "contrast", "p_sum", "p_sq", "p_n", "p_min", "p_max", "onset")
+_C = {name: i for i, name in enumerate(_COLS)}
+N_MFCC = 40
+NEUTRAL_TEMPO = 120.0
+
+class FrameRing:
+    # Fixed-capacity ring of per-frame rows; the oldest frames are overwritten
+    def __init__(self, capacity, width):
+        self.data = np.zeros((capacity, width))
+        self.capacity, self.start, self.count = capacity, 0, 0
+
+    def push(self, rows):
+        rows = rows[-self.capacity:]
+        idx = (self.start + self.count + np.arange(len(rows))) % self.capacity
+        self.data[idx] = rows
+        overflow = max(0, self.count + len(rows) - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.count = min(self.capacity, self.count + len(rows))
+
+    def view(self):
+        # Frames oldest → newest (a copy only once the ring has wrapped)
+        end = self.start + self.count
+        if end <= self.capacity: return self.data[self.start:end]
+        return np.concatenate([self.data[self.start:], self.data[:end - self.capacity]])
+
+    def clear(self):
+        self.start = self.count = 0
+
+class IncrementalAnalyser:
+    # Feeds fixed-size PCM chunks through the feature pipeline incrementally.
+    # Only frames completed by the new chunk are transformed; window-level
+    # features are aggregated from the last `window` seconds of frames held in a
+    # FrameRing, so per-chunk cost depends on chunk size, not on session length.
+    # Chunks at any input_sr are resampled on the fly to SR, the rate the
+    # classifier thresholds were set at.
+    def __init__(self, input_sr=SR, lang_key=DEFAULT_LANGUAGE, window=3.0, min_audio=0.5, keep_latencies=1000):
+        self.sr, self.input_sr, self.lang_key = SR, input_sr, lang_key
+        self._rs = None if input_sr == SR else soxr.ResampleStream(input_sr, SR, 1, dtype="float32")
+        self.ring  = FrameRing(max(1, int(window * SR / HOP)), len(_COLS) + N_MFCC)
+        self.min_frames = int(min_audio * SR / HOP)
+        self._win  = librosa.filters.get_window("hann", N_FFT, fftbins=True)
+        self._mel  = librosa.filters.mel(sr=SR, n_fft=N_FFT)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._last_mel = None
+        self.latencies_ms = deque(maxlen=keep_latencies)
+
+    def reset(self):
+        if self._rs is not None: self._rs.clear()
+        self.ring.clear()
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._last_mel = None
+        self.latencies_ms.clear()
+
+    def warmup(self, seconds=1.0):
+        # Pays numba JIT and FFT planning before the first real chunk
+        rng = np.random.default_rng(0)
+        self.push((0.1 * rng.standard_normal(int(seconds * self.input_sr))).astype(np.float32))
+        self.reset()
+
+    @staticmethod
+    def _to_float(chunk):
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = np.frombuffer(chunk, dtype="<i2")
+        chunk = np.asarray(chunk)
+        if chunk.dtype.kind in "iu":
+            return chunk.astype(np.float32) / float(np.iinfo(chunk.dtype).max + 1)
+        return chunk.astype(np.float32, copy=False)
+
+    def _frame_stats(self, frames):
+        # frames: N_FFT × n — the same per-frame maths extract_features applies to a clip
+        S   = np.abs(np.fft.rfft(frames * self._win[:, None], axis=0))
+        mel = librosa.power_to_db(self._mel @ S**2)
+        pitches, _ = librosa.piptrack(S=S, sr=self.sr, n_fft=N_FFT, hop_length=HOP)
+        voiced = pitches > 0
+        prev = mel[:, :1] if self._last_mel is None else self._last_mel
+        onset = np.median(np.maximum(0.0, np.diff(np.hstack([prev, mel]), axis=1)), axis=0)
+        self._last_mel = mel[:, -1:]
+        rows = np.empty((frames.shape[1], len(_COLS) + N_MFCC))
+        rows[:, _C["rms"]]      = np.sqrt(np.mean(frames**2, axis=0))
+        rows[:, _C["zcr"]]      = np.mean(librosa.zero_crossings(frames, axis=0), axis=0)
+        rows[:, _C["cent"]]     = librosa.feature.spectral_centroid(S=S, sr=self.sr)[0]
+        rows[:, _C["contrast"]] = np.mean(librosa.feature.spectral_contrast(S=S, sr=self.sr), axis=0)
+        rows[:, _C["p_sum"]]    = pitches.sum(axis=0)
+        rows[:, _C["p_sq"]]     = (pitches**2).sum(axis=0)
+        rows[:, _C["p_n"]]      = voiced.sum(axis=0)
+        rows[:, _C["p_min"]]    = np.where(voiced, pitches, np.inf).min(axis=0)
+        rows[:, _C["p_max"]]    = pitches.max(axis=0)
+        rows[:, _C["onset"]]    = onset
+        rows[:, len(_COLS):]    = librosa.feature.mfcc(S=mel, n_mfcc=N_MFCC).T
+        return rows
+
+    def features(self):
+        r = self.ring.view()
+        if len(r) < self.min_frames: return None
+        n  = r[:, _C["p_n"]].sum()
+        pm = r[:, _C["p_sum"]].sum() / n if n else 0.0
+        voiced = r[:, _C["p_n"]] > 0
+        onset  = r[:, _C["onset"]]
+        tempo  = (float(librosa.feature.tempo(onset_envelope=onset, sr=self.sr, hop_length=HOP)[0])
+                  if len(onset) * HOP >= 2 * self.sr else NEUTRAL_TEMPO)
+        return {
+            "mfcc_mean":   r[:, len(_COLS):].mean(axis=0),
+            "pitch_mean":  float(pm),
+            "pitch_std":   float(np.sqrt(max(0.0, r[:, _C["p_sq"]].sum() / n - pm**2))) if n else 0.0,
+            "pitch_range": float(r[voiced, _C["p_max"]].max() - r[voiced, _C["p_min"]].min()) if n else 0.0,
+            "rms_mean":    float(r[:, _C["rms"]].mean()),
+            "rms_std":     float(r[:, _C["rms"]].std()),
+            "rms_max":     float(r[:, _C["rms"]].max()),
+            "zcr":         float(r[:, _C["zcr"]].mean()),
+            "spec_cent":   float(r[:, _C["cent"]].mean()),
+            "contrast":    float(r[:, _C["contrast"]].mean()),
+            "tempo":       tempo,
+            "duration":    len(r) * HOP / self.sr,
+            # The share of the window the VAD counts as speech, from the same rms / zcr frames
+            "speech_ratio": float(np.mean(speech_mask(r[:, _C["rms"]], r[:, _C["zcr"]]))),
+        }
+
+    def push(self, chunk):
+        # Returns the updated classification (None until `min_audio` has arrived)
+        t0  = time.perf_counter()
+        x   = self._to_float(chunk)
+        if self._rs is not None: x = self._rs.resample_chunk(x)
+        buf = np.concatenate([self._tail, x])
+        n   = 0 if len(buf) < N_FFT else 1 + (len(buf) - N_FFT) // HOP
+        if n:
+            frames = librosa.util.frame(buf[:N_FFT + (n - 1) * HOP], frame_length=N_FFT, hop_length=HOP)
+            self.ring.push(self._frame_stats(frames))
+        self._tail = buf[n * HOP:]
+        features = self.features()
+        result = None
+        if features is not None:
+            emotion, probs = get_classifier().classify(features, self.lang_key)
+            result = {"emotion": emotion, "confidence": round(probs[emotion]*100, 1),
+                      "probs": probs, "features": features}
+        latency = (time.perf_counter() - t0) * 1000
+        self.latencies_ms.append(latency)
+        if result is not None: result["latency_ms"] = round(latency, 2)
+        return result
+
+    def latency_stats(self):
+        lat = np.array(self.latencies_ms)
+        if not len(lat): return {"chunks": 0}
+        return {"chunks": len(lat), "mean_ms": round(float(lat.mean()), 2),
+                "p50_ms": round(float(np.percentile(lat, 50)), 2),
+                "p95_ms": round(float(np.percentile(lat, 95)), 2),
+                "max_ms": round(float(lat.max()), 2)}
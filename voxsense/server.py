@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import numpy as np
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import SCALARS
+from .classify import DEFAULT_LANGUAGE, EMOTION_NAMES, resolve_language
+from .features import TOO_SHORT, extract_features
+from .metrics import CONTENT_TYPE, get_metrics, stage_timer
+from .model import get_classifier, with_inputs
+from .warmup import warmup
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 422: "Unprocessable Entity", 429: "Too Many Requests",
+            500: "Internal Server Error"}
+
+def _extract(audio_bytes):
+    # Worker-process entry point; the per-process cache would only fragment memory.
+    # Stage timings travel back with the result so the parent's /metrics sees them.
+    times = {}
+    features, error = extract_features(audio_bytes, use_cache=False, stage=stage_timer(times.__setitem__),
+                                       want=with_inputs(SCALARS))
+    return features, error, times
+
+def _checked(features, names):
+    # The classifier's inputs from a client-supplied dict, as finite floats (mfcc_mean as
+    # a 40-vector). Checked before batching so one malformed request cannot fail the others.
+    missing = [k for k in names if k not in features]
+    if missing: raise KeyError(f"features missing {', '.join(missing)}")
+    out = {}
+    for k in names:
+        try: v = np.asarray(features[k], dtype=np.float64) if k == "mfcc_mean" else float(features[k])
+        except (TypeError, ValueError): raise ValueError(f"feature {k} is not a number: {features[k]!r}") from None
+        if k == "mfcc_mean" and v.shape != (40,): raise ValueError(f"feature mfcc_mean needs 40 values, got {v.size}")
+        if not np.all(np.isfinite(v)): raise ValueError(f"feature {k} is not finite")
+        out[k] = v
+    return out
+
+def _log(message):
+    print(f"voxsense: {message}", file=sys.stderr, flush=True)
+
+def _response(status, payload, keep_alive, extra_headers=()):
+    # dict/list payloads go out as JSON, str payloads as Prometheus text
+    text = isinstance(payload, str)
+    body = payload.encode() if text else json.dumps(payload, ensure_ascii=False).encode()
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            f"Content-Type: {CONTENT_TYPE if text else 'application/json; charset=utf-8'}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}", *extra_headers]
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+class MicroBatcher:
+    # Collects classification requests for max_wait seconds (up to max_batch rows)
+    # and scores them with one classify_batch call, so concurrent requests share
+    # the vectorised path instead of each walking the rules alone.
+    def __init__(self, max_batch=64, max_wait=0.005):
+        self.max_batch, self.max_wait = max_batch, max_wait
+        self.queue = asyncio.Queue()
+        self.batches = self.rows = 0
+
+    async def classify(self, features, lang_key):
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((features, lang_key, fut))
+        return await fut
+
+    async def run(self):
+        while True:
+            batch = [await self.queue.get()]
+            # Fixed collection window, then drain without awaiting: cancelling a
+            # pending queue.get() (as wait_for would) can drop an item on 3.11.
+            if self.max_wait > 0: await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            t0 = time.perf_counter()
+            classifier = get_classifier()
+            try:
+                P = classifier.classify_batch([f for f, _, _ in batch], [lang for _, lang, _ in batch])
+            except Exception:
+                # One bad row must not fail its neighbours: score each alone so only
+                # the offending request gets the exception
+                P = []
+                for f, lang, fut in batch:
+                    try: P.append(classifier.classify_batch([f], [lang])[0])
+                    except Exception as e:
+                        P.append(None)
+                        if not fut.done(): fut.set_exception(e)
+            # One "classify" observation per vectorised call, not per request
+            get_metrics().observe("classify", time.perf_counter() - t0)
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, _, fut), p in zip(batch, P):
+                if p is not None and not fut.done():
+                    probs = dict(zip(EMOTION_NAMES, p.tolist()))
+                    fut.set_result((max(probs, key=probs.get), probs))
+
+class InferenceServer:
+    # Minimal HTTP/1.1 JSON service around extract_features + classify_emotion.
+    #   GET  /health       liveness plus queue / batching counters
+    #   GET  /metrics      per-stage latency histograms, Prometheus text format 0.0.4
+    #   POST /v1/analyse   raw audio bytes as the body, ?language=Bengali
+    #   POST /v1/classify  {"features": {...}, "language": "..."} — no audio work
+    # At most max_pending requests are admitted at once; the rest get 429.
+    def __init__(self, workers=None, max_pending=64, max_batch=64, max_wait_ms=5.0, max_body_mb=25,
+                 warm=True):
+        self.workers     = workers or os.cpu_count() or 1
+        self.warm        = warm
+        self.max_pending = max_pending
+        self.max_body    = max_body_mb << 20
+        self.batcher     = MicroBatcher(max_batch, max_wait_ms / 1000)
+        self.pending     = 0
+        self.served = self.rejected = 0
+        self.started = time.time()
+        self.pool = None
+
+    def health(self):
+        return {"status": "ok", "uptime_s": round(time.time() - self.started, 1),
+                "classifier": get_classifier().name, "workers": self.workers, "pending": self.pending, "max_pending": self.max_pending,
+                "served": self.served, "rejected": self.rejected,
+                "batches": self.batcher.batches,
+                "mean_batch": round(self.batcher.rows / self.batcher.batches, 2) if self.batcher.batches else 0.0}
+
+    async def _analyse(self, body, query):
+        t0 = time.perf_counter()
+        lang_key = resolve_language(query.get("language", [DEFAULT_LANGUAGE])[0])
+        loop = asyncio.get_running_loop()
+        features, error, times = await loop.run_in_executor(self.pool, _extract, body)
+        for name, seconds in times.items(): get_metrics().observe(name, seconds)
+        if error:
+            # Exception text (a decoder's message, object reprs) stays in the server log
+            if error != TOO_SHORT: _log(f"analyse failed: {error}")
+            return 422, {"error": error if error == TOO_SHORT else "could not decode audio"}
+        emotion, probs = await self.batcher.classify(features, lang_key)
+        get_metrics().record_startup("first_request", time.perf_counter() - t0)
+        return 200, {"emotion": emotion, "confidence": round(probs[emotion]*100, 1), "probs": probs,
+                     "language": lang_key.split(" (")[0],
+                     "features": {k: round(features[k], 6) for k in SCALARS}}
+
+    async def _classify(self, body):
+        req = json.loads(body)
+        if not isinstance(req, dict) or not isinstance(req.get("features"), dict):
+            raise ValueError('body must be a JSON object with a "features" object')
+        lang_key = resolve_language(str(req.get("language", DEFAULT_LANGUAGE)))
+        features = _checked(req["features"], get_classifier().features)
+        emotion, probs = await self.batcher.classify(features, lang_key)
+        return 200, {"emotion": emotion, "confidence": round(probs[emotion]*100, 1), "probs": probs}
+
+    async def _route(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            return (200, self.health()) if method == "GET" else (405, {"error": "use GET"})
+        if url.path == "/metrics":
+            return (200, get_metrics().render()) if method == "GET" else (405, {"error": "use GET"})
+        if url.path not in ("/v1/analyse", "/v1/classify"):
+            return 404, {"error": f"no route {url.path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return 429, {"error": "server busy, retry shortly", "pending": self.pending}
+        self.pending += 1
+        try:
+            if url.path == "/v1/analyse": status, payload = await self._analyse(body, parse_qs(url.query))
+            else:                         status, payload = await self._classify(body)
+            self.served += status == 200
+            return status, payload
+        except (KeyError, ValueError) as e:
+            return 400, {"error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            _log(f"{url.path} failed: {type(e).__name__}: {e}")
+            return 500, {"error": "internal error"}
+        finally:
+            self.pending -= 1
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, version = lines[0].split(" ", 2)
+                headers = {k.strip().lower(): v.strip() for k, v in
+                           (line.split(":", 1) for line in lines[1:] if ":" in line)}
+                keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                size = int(headers.get("content-length", 0))
+                if size > self.max_body:
+                    writer.write(_response(413, {"error": "body too large"}, False))
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(size) if size else b""
+                status, payload = await self._route(method, target, body)
+                writer.write(_response(status, payload, keep, ("Retry-After: 1",) if status == 429 else ()))
+                await writer.drain()
+                if not keep: break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000):
+        # Each worker warms up as it starts; spawning them all before listening means
+        # the first requests after a deploy don't queue behind librosa's lazy imports / JIT
+        self.pool = ProcessPoolExecutor(self.workers, initializer=warmup if self.warm else None)
+        if self.warm:
+            t0 = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self.pool, os.getpid) for _ in range(self.workers)))
+            get_metrics().record_startup("warmup", time.perf_counter() - t0)
+            print(f"voxsense workers warm in {time.perf_counter() - t0:.2f}s", flush=True)
+        batcher = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self._handle, host, port)
+        print(f"voxsense serving on http://{host}:{port} · {self.workers} workers · "
+              f"max {self.max_pending} pending", flush=True)
+        try:
+            async with server: await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.pool.shutdown(cancel_futures=True)
+
+def serve(host="127.0.0.1", port=8000, **kwargs):
+    try: asyncio.run(InferenceServer(**kwargs).serve(host, port))
+    except KeyboardInterrupt: pass
@@ -0,0 +1,108 @@
+import sys
+import time
+from datetime import datetime
+import numpy as np
+
+from .cache import get_cache
+from .classify import EMOTION_NAMES, LANGUAGES
+
+# Per-session UI state kept small and bounded. Every Streamlit session holds
+#   - a HistoryRing: a fixed-size structured array instead of an append-only list of dicts
+#   - the key of its last upload in the shared AudioCache instead of the raw bytes, so
+#     sessions analysing the same file share one copy and idle uploads can be evicted
+#   - likewise the key of its last timeline, held in the cache as one structured array
+#     (a 60-minute call is ~720 windows; as dicts in every session that adds up)
+_LANG_KEYS = tuple(LANGUAGES)
+_ROW = np.dtype([("ts", "f8"), ("emotion", "u1"), ("language", "u1"), ("confidence", "f4")])
+
+class HistoryRing:
+    def __init__(self, capacity=6):
+        self._rows = np.zeros(capacity, _ROW)
+        self.count = 0                    # analyses ever appended, not just those still held
+
+    def __len__(self):
+        return min(self.count, len(self._rows))
+
+    def append(self, emotion, confidence, lang_key, ts=None):
+        self._rows[self.count % len(self._rows)] = (ts or time.time(), EMOTION_NAMES.index(emotion),
+                                                    _LANG_KEYS.index(lang_key), confidence)
+        self.count += 1
+
+    def latest(self, n=None):
+        # Newest first, as the dicts the history panel renders
+        n = len(self) if n is None else min(n, len(self))
+        for i in range(self.count - 1, self.count - 1 - n, -1):
+            ts, emotion, language, confidence = self._rows[i % len(self._rows)].tolist()
+            yield {"time": datetime.fromtimestamp(ts).strftime("%H:%M"), "emotion": EMOTION_NAMES[emotion],
+                   "confidence": round(confidence, 1), "language": _LANG_KEYS[language].split(" ")[0]}
+
+    @property
+    def nbytes(self):
+        return self._rows.nbytes
+
+def put_audio(audio_bytes):
+    # Stores an upload in the shared cache and returns its key; the session keeps only the key
+    cache = get_cache()
+    key   = cache.key(audio_bytes, "upload")
+    if cache.get(key) is None: cache.put(key, {"audio": np.frombuffer(audio_bytes, np.uint8)})
+    return key
+
+def get_audio(key):
+    # Read-only uint8 view of the upload (bytes-like), or None once it has been evicted
+    hit = get_cache().get(key) if key else None
+    return hit["audio"] if hit is not None else None
+
+def put_timeline(audio_key, lang_key, timeline):
+    # Stores a per-window timeline (analyse_upload's "timeline") in the shared cache and
+    # returns its key. Rows hold start / end and, per window and per channel, the emotion
+    # index and confidence; channel labels are kept once alongside.
+    if not timeline: return None
+    labels = [c["label"] for c in timeline[0].get("channels", ())]
+    n      = len(labels)
+    dtype  = [("start", "f8"), ("end", "f8")]
+    if "emotion" in timeline[0]: dtype += [("emotion", "u1"), ("confidence", "f4")]
+    if n: dtype += [("ch_emotion", "u1", (n,)), ("ch_confidence", "f4", (n,))]
+    rows = np.zeros(len(timeline), dtype)
+    for row, w in zip(rows, timeline):
+        row["start"], row["end"] = w["start"], w["end"]
+        if "emotion" in w: row["emotion"], row["confidence"] = EMOTION_NAMES.index(w["emotion"]), w["confidence"]
+        if n:
+            row["ch_emotion"]    = [EMOTION_NAMES.index(c["emotion"]) for c in w["channels"]]
+            row["ch_confidence"] = [c["confidence"] for c in w["channels"]]
+    cache = get_cache()
+    key   = cache.key(audio_key.encode(), "timeline", language=lang_key)
+    cache.put(key, {"rows": rows, "labels": np.array(labels, dtype=str)})
+    return key
+
+def get_timeline(key):
+    # The timeline as the list of dicts the charts take, or None once it has been evicted
+    hit = get_cache().get(key) if key else None
+    if hit is None: return None
+    rows, labels = hit["rows"], hit["labels"].tolist()
+    timeline = []
+    for row in rows:
+        w = {"start": float(row["start"]), "end": float(row["end"])}
+        if "emotion" in rows.dtype.names:
+            w.update(emotion=EMOTION_NAMES[row["emotion"]], confidence=round(float(row["confidence"]), 1))
+        if labels:
+            w["channels"] = [{"label": label, "emotion": EMOTION_NAMES[e], "confidence": round(float(c), 1)}
+                             for label, e, c in zip(labels, row["ch_emotion"].tolist(), row["ch_confidence"].tolist())]
+        timeline.append(w)
+    return timeline
+
+def nbytes(obj, _seen=None):
+    # Deep size of session-state values; shared cache entries referenced by key count only as the key
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen: return 0
+    _seen.add(id(obj))
+    if isinstance(obj, np.ndarray):      return sys.getsizeof(obj)      # includes the buffer only if owned
+    if isinstance(obj, HistoryRing):     return sys.getsizeof(obj) + obj.nbytes
+    if isinstance(obj, dict):            return sys.getsizeof(obj) + sum(nbytes(k, _seen) + nbytes(v, _seen)
+                                                                         for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):   return sys.getsizeof(obj) + sum(nbytes(v, _seen) for v in obj)
+    return sys.getsizeof(obj)
+
+def session_report(state):
+    # Bytes held by one session: total plus a per-key breakdown, largest first
+    sizes = {k: nbytes(v) for k, v in state.items()}
+    return {"total": sum(sizes.values()), "keys": dict(sorted(sizes.items(), key=lambda kv: -kv[1]))}
@@ -0,0 +1,146 @@
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+from contextlib import contextmanager
+try: import fcntl
+except ImportError: fcntl = None   # Windows: writers are only serialised within one process
+
+from .audio import DEFAULT_PROFILE
+from .classify import FEATURE_COLUMNS
+from .features import DEFAULT_PITCH, DEFAULT_VAD, SCALARS
+
+# Persistent columnar feature store, one directory per corpus:
+#   keys.bin    N × 32 bytes   sha256 of each file's raw bytes (the index)
+#   scalars.f8  N × 12 float64 COLUMNS below; the classifier's FEATURE_COLUMNS come
+#                              first, so matrix() is a zero-copy view of the memmap
+#   mfcc.f4     N × 40 float32 mfcc_mean
+#   meta.json   column layout plus the pitch / profile / vad the features were extracted with
+#   lock        flock'd by whichever writer is appending
+# Rows only ever get appended. keys.bin is written last, so a row counts as present
+# only once its key is on disk. A torn write leaves at most a partial row in the
+# value files, and the next writer truncates it. Any number of writers may share a
+# store: each append takes the lock and first picks up the rows the others added.
+COLUMNS = FEATURE_COLUMNS + tuple(c for c in SCALARS if c not in FEATURE_COLUMNS)
+N_MFCC  = 40
+_KEY    = 32
+
+class StoreMismatch(ValueError): pass
+
+class FeatureStore:
+    def __init__(self, path, pitch=None, profile=None, vad=None, readonly=False):
+        self.path, self.readonly = path, readonly
+        self._lock = threading.Lock()
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as fh: self.meta = json.load(fh)
+            if tuple(self.meta["columns"]) != COLUMNS or self.meta["n_mfcc"] != N_MFCC:
+                raise StoreMismatch(f"{path}: store layout {self.meta['columns']} does not match this version")
+        elif readonly:
+            raise FileNotFoundError(f"no feature store at {path}")
+        else:
+            os.makedirs(path, exist_ok=True)
+            self.meta = {"columns": list(COLUMNS), "n_mfcc": N_MFCC,
+                         "pitch": pitch or DEFAULT_PITCH, "profile": profile or DEFAULT_PROFILE,
+                         "vad": DEFAULT_VAD if vad is None else bool(vad)}
+            with open(meta_path, "w") as fh: json.dump(self.meta, fh, indent=2)
+        self._n, self._index, self._maps = 0, {}, {}
+        if readonly: self.refresh()
+        else:
+            with self._writing(): pass
+
+    def refresh(self):
+        # Picks up rows appended by another process since this store was opened
+        keys = self._file("keys.bin")
+        n = os.path.getsize(keys) // _KEY if os.path.exists(keys) else 0
+        if n == self._n: return
+        with open(keys, "rb") as fh:
+            fh.seek(self._n * _KEY)
+            new = fh.read((n - self._n) * _KEY)
+        self._index.update((new[j:j + _KEY], self._n + j // _KEY) for j in range(0, len(new), _KEY))
+        self._n = n
+
+    @contextmanager
+    def _writing(self):
+        # Exclusive across threads and processes. Inside, the index is current and the
+        # value files hold exactly _n rows, so the next row goes at index _n.
+        with self._lock, open(self._file("lock"), "a") as lock:
+            if fcntl: fcntl.flock(lock, fcntl.LOCK_EX)
+            self.refresh()
+            for name, width in (("keys.bin", _KEY), ("scalars.f8", 8 * len(COLUMNS)), ("mfcc.f4", 4 * N_MFCC)):
+                with open(self._file(name), "ab") as fh: fh.truncate(self._n * width)
+            yield
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _map(self, name, dtype, width):
+        # Read-only N × width memmap; mapping an empty file is an error, so N = 0 gets an empty array
+        if not self._n: return np.empty((0, width), dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode="r", shape=(self._n, width))
+
+    def _mapped(self, name, dtype, width):
+        if self._maps.get(name, (None, -1))[1] != self._n:
+            self._maps[name] = (self._map(name, dtype, width), self._n)
+        return self._maps[name][0]
+
+    @staticmethod
+    def key(audio_bytes):
+        return hashlib.sha256(audio_bytes).digest()
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, audio_bytes):
+        return self.key(audio_bytes) in self._index
+
+    def check(self, pitch, profile, vad=False):
+        # Rows are only comparable if extracted the same way
+        held = (self.meta["pitch"], self.meta["profile"], self.meta.get("vad", False))
+        if (pitch, profile, bool(vad)) != held:
+            raise StoreMismatch(f"feature store {self.path} holds pitch={held[0]} profile={held[1]} vad={held[2]}"
+                             f" features, not pitch={pitch} profile={profile} vad={bool(vad)}")
+
+    @property
+    def scalars(self):
+        return self._mapped("scalars.f8", "<f8", len(COLUMNS))
+
+    @property
+    def mfcc(self):
+        return self._mapped("mfcc.f4", "<f4", N_MFCC)
+
+    def matrix(self):
+        # N × FEATURE_COLUMNS view for score_matrix / classify_batch / sweep_languages
+        return self.scalars[:, :len(FEATURE_COLUMNS)]
+
+    def column(self, name):
+        return self.scalars[:, COLUMNS.index(name)]
+
+    def keys(self):
+        return [k.hex() for k in self._index]
+
+    def get(self, audio_bytes):
+        # Features dict for a file, shaped like extract_features' output, or None
+        i = self._index.get(self.key(audio_bytes))
+        if i is None: return None
+        features = dict(zip(COLUMNS, self.scalars[i].tolist()))
+        features["mfcc_mean"] = np.array(self.mfcc[i])
+        return features
+
+    def add(self, audio_bytes, features, key=None):
+        # Appends one row unless the file is already stored; returns its row number.
+        # `key` (a digest from FeatureStore.key) stands in for the bytes when they live elsewhere.
+        if self.readonly: raise PermissionError(f"feature store {self.path} is open read-only")
+        key = key or self.key(audio_bytes)
+        if key in self._index: return self._index[key]
+        with self._writing():
+            if key in self._index: return self._index[key]
+            scalars = np.array([features[c] for c in COLUMNS], "<f8")
+            mfcc    = np.asarray(features["mfcc_mean"], "<f4").reshape(N_MFCC)
+            for name, data in (("scalars.f8", scalars), ("mfcc.f4", mfcc), ("keys.bin", key)):
+                with open(self._file(name), "ab") as fh:
+                    fh.write(data if isinstance(data, bytes) else data.tobytes())
+            self._index[key] = self._n
+            self._n += 1
+            return self._n - 1
@@ -0,0 +1,54 @@
+import numpy as np
+import librosa
+import soundfile as sf
+
+from .classify import DEFAULT_LANGUAGE
+from .features import SR, features_from_signal
+from .model import get_classifier, with_inputs
+
+def duration_of(source):
+    # Full length in seconds from the header alone — nothing is decoded
+    seconds = sf.info(source).duration
+    if hasattr(source, "seek"): source.seek(0)
+    return seconds
+
+def channels_of(source):
+    # Channel count from the header alone
+    channels = sf.info(source).channels
+    if hasattr(source, "seek"): source.seek(0)
+    return channels
+
+def iter_windows(source, window=10.0, hop=5.0, sr=SR, mono=True):
+    # Reads `source` (path or file object) block by block and yields
+    # (start_seconds, mono float32 window at `sr`). Only one window is ever held,
+    # so memory stays flat however long the recording is. mono=False yields
+    # (channels, samples) windows instead.
+    if not 0 < hop <= window:
+        raise ValueError(f"hop must be in (0, window], got hop={hop} window={window}")
+    native = sf.info(source).samplerate
+    if hasattr(source, "seek"): source.seek(0)
+    win = int(round(window * native))
+    step = int(round(hop * native))
+    for i, block in enumerate(sf.blocks(source, blocksize=win, overlap=win - step,
+                                        dtype="float32", always_2d=True)):
+        if mono: y = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+        else:    y = np.ascontiguousarray(block.T)
+        if native != sr: y = librosa.resample(y, orig_sr=native, target_sr=sr)
+        yield i * step / native, y
+        if len(block) < win: break
+
+def analyse_stream(source, lang_key=DEFAULT_LANGUAGE, window=10.0, hop=5.0, want=None, tap=None):
+    # Per-window emotion timeline as a generator. Windows shorter than the 0.5 s
+    # minimum extract_features accepts (only ever the tail) are skipped. want: the
+    # features each row carries besides the classifier's inputs (default: all).
+    # tap(start, y) sees every window first, e.g. to build a waveform envelope on the way.
+    classifier = get_classifier()
+    want = with_inputs(want, classifier)
+    for start, y in iter_windows(source, window, hop):
+        if tap: tap(start, y)
+        if len(y) < SR * 0.5: continue
+        features = features_from_signal(y, SR, want=want)
+        emotion, probs = classifier.classify(features, lang_key)
+        yield {"start": round(start, 3), "end": round(start + len(y)/SR, 3),
+               "emotion": emotion, "confidence": round(probs[emotion]*100, 1),
+               "probs": probs, "features": features}
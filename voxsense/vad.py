@@ -0,0 +1,28 @@
+import numpy as np
+
+# Energy / zero-crossing voice-activity detection on the frames extract_features
+# already computes (rms and zcr at N_FFT / HOP, one value per STFT column). It
+# adapts to each clip: a frame counts as speech when it clears both the clip's
+# noise floor plus a margin and a floor relative to the loudest frame. The
+# threshold never rises above peak − max_drop_db, so quiet speech survives in
+# clips that have no silence at all. Quieter frames with a high ZCR (fricatives:
+# s, sh, f) are kept too, as long as they still sit above the noise floor;
+# broadband noise also has a high ZCR. A hangover of a few frames either side keeps onsets
+# and decays. This removes silence and low-level noise; music or crosstalk at
+# speech level still passes. Two guards keep a clip with no speech from passing
+# whole: nothing below min_dbfs counts as speech (digital silence, a quiet room), and
+# a clip whose loudest frames sit within min_range_db of its noise floor (steady
+# noise, mains hum) has no speech in it at all.
+MIN_SPEECH_FRAMES = 8          # below this the clip is analysed ungated
+
+def speech_mask(rms, zcr, margin_db=6.0, floor_db=50.0, max_drop_db=20.0, fricative_zcr=0.25, hangover=4,
+                min_dbfs=-50.0, min_range_db=6.0):
+    db    = 20 * np.log10(np.maximum(np.asarray(rms, np.float64), 1e-10))
+    peak  = db.max()
+    noise = np.percentile(db, 10)
+    if peak < min_dbfs or peak - noise < min_range_db: return np.zeros(len(db), dtype=bool)
+    thresh = max(min(max(noise + margin_db, peak - floor_db), peak - max_drop_db), min_dbfs)
+    soft  = max(thresh - margin_db, noise + margin_db / 2, min_dbfs)
+    mask  = (db > thresh) | ((db > soft) & (np.asarray(zcr) > fricative_zcr))
+    if hangover: mask = np.convolve(mask, np.ones(2 * hangover + 1), "same") > 0
+    return mask
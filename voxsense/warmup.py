@@ -0,0 +1,56 @@
+import io
+import os
+import time
+import threading
+import numpy as np
+import soundfile as sf
+
+from .model import get_classifier
+from .features import extract_features
+from .metrics import get_metrics, stage_timer
+from .pitch import PITCH_BACKENDS
+
+# Cold start. `import voxsense` is cheap because librosa loads its submodules
+# (scipy.signal, numba, audioread...) lazily on first attribute access. The
+# first analysis in a fresh process therefore pays those imports plus numba
+# compiling, or loading from its on-disk cache, the beat-tracking and peak-
+# picking kernels. That costs seconds, while every later analysis takes
+# milliseconds. warmup() pays the cost once on a short synthetic clip that
+# goes through the same decode → resample → features → classify path as an
+# upload. Point NUMBA_CACHE_DIR at a persistent, writable directory and run
+# `python -m voxsense warmup` at image build time, so new pods load compiled
+# kernels instead of JIT-compiling them.
+WARMUP = os.environ.get("VOXSENSE_WARMUP", "1") != "0"
+
+def _clip(seconds, sr):
+    t = np.arange(int(seconds * sr)) / sr
+    y = 0.3 * np.sin(2 * np.pi * 160 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    buf = io.BytesIO()
+    sf.write(buf, y.astype(np.float32), sr, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+def warmup(seconds=1.0, sr=16000):
+    # A non-22.05 kHz source so the resampler is loaded too. Every pitch backend
+    # is run, since the default can be switched per request. Returns seconds per stage.
+    t0, times = time.perf_counter(), {}
+    def add(name, seconds): times[name] = times.get(name, 0.0) + seconds
+    audio_bytes = _clip(seconds, sr)
+    for pitch in PITCH_BACKENDS:
+        features, error = extract_features(audio_bytes, use_cache=False, pitch=pitch, stage=stage_timer(add))
+        if error: raise RuntimeError(f"warm-up failed: {error}")
+    get_classifier().classify(features)
+    times["total"] = time.perf_counter() - t0
+    get_metrics().record_startup("warmup", times["total"])
+    return times
+
+_thread, _thread_lock = None, threading.Lock()
+
+def start_warmup():
+    # Idempotent per process: Streamlit re-executes app.py on every interaction,
+    # but only the first call starts the background thread
+    global _thread
+    with _thread_lock:
+        if _thread is None and WARMUP:
+            _thread = threading.Thread(target=warmup, name="voxsense-warmup", daemon=True)
+            _thread.start()
+        return _thread